@@ -1,15 +1,16 @@
 import sys
 import serial
-import serial.tools.list_ports
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QLabel, QSlider, QPushButton, 
                              QComboBox, QGroupBox, QTextEdit, QCheckBox,
                              QSpinBox, QFrame, QGridLayout, QLineEdit, QRadioButton,
                              QButtonGroup)
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont, QPalette, QColor, QIcon, QPainter, QPen, QBrush
 import datetime
 
+from port_watcher import shared_watcher
+
 
 class DutyCycleGraph(QWidget):
     """Custom widget to display duty cycle waveform"""
@@ -122,13 +123,20 @@ class FPGAControlGUI(QMainWindow):
     def __init__(self):
         super().__init__()
         self.serial_port = None
-        self.auto_refresh_timer = QTimer()
-        self.auto_refresh_timer.timeout.connect(self.refresh_ports)
         self.sent_count = 0
         
         self.init_ui()
-        self.refresh_ports()
-        self.auto_refresh_timer.start(3000)
+        
+        # Ports are enumerated on the watcher thread; the combo box only changes on add/remove
+        self.port_watcher = shared_watcher()
+        self.port_watcher.ports_added.connect(self.on_ports_added)
+        self.port_watcher.ports_removed.connect(self.on_ports_removed)
+        self.port_watcher.refreshed.connect(self.on_ports_refreshed)
+        known = self.port_watcher.ports()
+        if known:
+            self.on_ports_added(sorted(known.items()))
+        else:
+            self.port_combo.addItem("No ports detected")
         
     def init_ui(self):
         self.setWindowTitle("FPGA UART Control Center")
@@ -572,30 +580,33 @@ class FPGAControlGUI(QMainWindow):
         return group
     
     def refresh_ports(self):
-        """Refresh available COM ports"""
-        current_port = self.port_combo.currentText()
-        self.port_combo.clear()
-        
-        ports = serial.tools.list_ports.comports()
-        port_list = []
-        
-        for port in ports:
-            port_description = f"{port.device} - {port.description}"
-            port_list.append(port_description)
-            self.port_combo.addItem(port_description, port.device)
-        
-        if not port_list:
+        """Ask the port watcher for an immediate scan"""
+        self.port_watcher.refresh()
+    
+    def on_ports_added(self, ports):
+        """Add newly detected ports to the combo box"""
+        placeholder = self.port_combo.findText("No ports detected")
+        if placeholder >= 0:
+            self.port_combo.removeItem(placeholder)
+        for device, description in ports:
+            if self.port_combo.findData(device) < 0:
+                self.port_combo.addItem(f"{device} - {description}", device)
+    
+    def on_ports_removed(self, devices):
+        """Drop ports that have gone away, the selection stays otherwise"""
+        for device in devices:
+            index = self.port_combo.findData(device)
+            if index >= 0:
+                self.port_combo.removeItem(index)
+        if self.port_combo.count() == 0:
             self.port_combo.addItem("No ports detected")
-            if self.sender() == self.refresh_btn:
-                self.log_message("⚠️ No COM ports detected", "#e8b75d")
+    
+    def on_ports_refreshed(self, count):
+        """Report the result of a refresh button scan"""
+        if count == 0:
+            self.log_message("⚠️ No COM ports detected", "#e8b75d")
         else:
-            if self.sender() == self.refresh_btn:
-                self.log_message(f"✓ Found {len(port_list)} port(s)", "#7dc993")
-            
-            for i in range(self.port_combo.count()):
-                if current_port in self.port_combo.itemText(i):
-                    self.port_combo.setCurrentIndex(i)
-                    break
+            self.log_message(f"✓ Found {count} port(s)", "#7dc993")
     
     def connect_serial(self):
         """Connect to selected serial port"""
@@ -765,7 +776,6 @@ class FPGAControlGUI(QMainWindow):
     
     def closeEvent(self, event):
         """Handle window close event"""
-        self.auto_refresh_timer.stop()
         if self.serial_port and self.serial_port.is_open:
             self.serial_port.close()
         event.accept()
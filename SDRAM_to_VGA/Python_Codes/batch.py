@@ -0,0 +1,175 @@
+import argparse
+import glob
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from PIL import Image
+
+from convert import image_to_words
+from bin_to_text import MEM_LAYOUT, write_vhdl_mem
+from cache import ConversionCache, cache_key
+from formats import FORMATS, get_format
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tif', '.tiff')
+RESAMPLE_FILTERS = ('NEAREST', 'BOX', 'BILINEAR', 'HAMMING', 'BICUBIC', 'LANCZOS')
+
+def find_images(inputs):
+    # Accept directories, glob patterns and plain file paths; each file is listed once
+    images = []
+    seen = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            paths = [os.path.join(item, name) for name in sorted(os.listdir(item))]
+        else:
+            paths = sorted(glob.glob(item))
+        for path in paths:
+            real = os.path.realpath(path)
+            if path.lower().endswith(IMAGE_EXTENSIONS) and real not in seen:
+                seen.add(real)
+                images.append(path)
+    return images
+
+def check_output_names(images, out_dir):
+    # Outputs are named by basename, so a/x.png and b/x.png would overwrite each other
+    owners = {}
+    for image_path in images:
+        owners.setdefault(output_paths(image_path, out_dir)[0], []).append(image_path)
+    clashes = [paths for paths in owners.values() if len(paths) > 1]
+    if clashes:
+        names = '; '.join(' and '.join(paths) for paths in clashes)
+        raise ValueError(f"Different images would write the same output files: {names}")
+
+def output_paths(image_path, out_dir):
+    base = os.path.splitext(os.path.basename(image_path))[0]
+    return (os.path.join(out_dir, base + '_conv.bin'),
+            os.path.join(out_dir, base + '.mem'))
+
+def params_path(bin_path):
+    # Conversion parameters of the outputs, so a different --format etc. counts as stale
+    return os.path.splitext(bin_path)[0] + '.params'
+
+def write_params(bin_path, params):
+    with open(params_path(bin_path), 'w') as f:
+        json.dump(params, f, sort_keys=True)
+
+def is_up_to_date(image_path, outputs, params):
+    source_mtime = os.path.getmtime(image_path)
+    if not all(os.path.exists(p) and os.path.getmtime(p) >= source_mtime for p in outputs):
+        return False
+    try:
+        with open(params_path(outputs[0])) as f:
+            return json.load(f) == params
+    except (OSError, ValueError):
+        return False  # made before parameters were recorded, or unreadable
+
+def conversion_params(width, height, resample, pixel_format, dither):
+    return {'width': width, 'height': height, 'resample': resample,
+            'format': pixel_format, 'dither': bool(dither), 'mem_layout': MEM_LAYOUT}
+
+def convert_one(image_path, out_dir, width=640, height=480, resample='BICUBIC',
+                cache_dir=None, cache_bytes=1 << 30, pixel_format='rgb444', dither=False):
+    # image -> RGB444 words -> .bin and .mem in one pass, nothing is read back from disk
+    start = time.perf_counter()
+    bin_path, mem_path = output_paths(image_path, out_dir)
+    params = conversion_params(width, height, resample, pixel_format, dither)
+
+    if cache_dir is not None:
+        cache = ConversionCache(cache_dir, cache_bytes)
+        format_key = pixel_format + ('+bayer' if dither else '')
+        key = cache_key(image_path, width, height, resample, format_key)
+        hit = cache.get(key)
+        if hit is not None:
+            # Cache hit: copy the stored artifacts without decoding the image
+            try:
+                shutil.copyfile(hit[0], bin_path)
+                shutil.copyfile(hit[1], mem_path)
+                write_params(bin_path, params)
+                return image_path, time.perf_counter() - start, True
+            except FileNotFoundError:
+                pass  # evicted by another worker meanwhile: convert as on a miss
+
+    words = image_to_words(Image.open(image_path), width, height, getattr(Image, resample),
+                           pixel_format, dither)
+    words.astype(get_format(pixel_format).dtype).tofile(bin_path)
+    write_vhdl_mem(words, mem_path)
+    write_params(bin_path, params)
+
+    if cache_dir is not None:
+        cache.put_files(key, bin_path, mem_path)
+
+    return image_path, time.perf_counter() - start, False
+
+def try_convert(image_path, *args):
+    # convert_one in a worker; a failure comes back as its message instead of being raised,
+    # so one unreadable image does not stop the rest of the batch
+    start = time.perf_counter()
+    try:
+        return convert_one(image_path, *args) + (None,)
+    except Exception as e:
+        return image_path, time.perf_counter() - start, False, f"{type(e).__name__}: {e}"
+
+def convert_batch(inputs, out_dir, width=640, height=480, jobs=None, force=False,
+                  resample='BICUBIC', cache_dir=None, cache_bytes=1 << 30,
+                  pixel_format='rgb444', dither=False):
+    images = find_images(inputs)
+    check_output_names(images, out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+
+    params = conversion_params(width, height, resample, pixel_format, dither)
+    todo = []
+    for image_path in images:
+        if not force and is_up_to_date(image_path, output_paths(image_path, out_dir), params):
+            print(f"  skip   {image_path} (up to date)")
+        else:
+            todo.append(image_path)
+
+    start = time.perf_counter()
+    failed = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(try_convert, p, out_dir, width, height, resample,
+                               cache_dir, cache_bytes, pixel_format, dither) for p in todo]
+        for future in as_completed(futures):
+            image_path, elapsed, cached, error = future.result()
+            if error:
+                failed.append(image_path)
+                print(f"  failed {image_path}: {error} ({elapsed*1000:.1f} ms)")
+                continue
+            status = 'cached' if cached else 'done  '
+            print(f"  {status} {image_path} ({elapsed*1000:.1f} ms)")
+
+    total = time.perf_counter() - start
+    print(f"Converted {len(todo) - len(failed)} of {len(images)} image(s) in {total:.2f} s"
+          + (f", {len(failed)} failed" if failed else ""))
+    return todo, failed
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert images to SDRAM .bin and VHDL .mem files")
+    parser.add_argument('inputs', nargs='+', help="image files, directories or glob patterns")
+    parser.add_argument('-o', '--out-dir', default='.', help="output directory")
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('-f', '--force', action='store_true', help="rebuild outputs that are up to date")
+    parser.add_argument('--resample', choices=RESAMPLE_FILTERS, default='BICUBIC', help="resize filter")
+    parser.add_argument('--format', choices=sorted(FORMATS), default='rgb444', help="SDRAM pixel format")
+    parser.add_argument('--dither', action='store_true', help="apply ordered (Bayer) dithering")
+    parser.add_argument('--cache-dir', default=None, help="reuse artifacts of unchanged images from this cache")
+    parser.add_argument('--cache-size-mb', type=int, default=1024, help="cache size limit (LRU eviction)")
+    args = parser.parse_args()
+
+    try:
+        todo, failed = convert_batch(args.inputs, args.out_dir, args.width, args.height, args.jobs,
+                                     args.force, args.resample, args.cache_dir, args.cache_size_mb << 20,
+                                     args.format, args.dither)
+    except ValueError as e:
+        parser.error(str(e))
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    # Example usage: python batch.py frames/ "shots/*.png" -o out -j 4
+    main()
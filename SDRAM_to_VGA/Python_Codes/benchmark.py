@@ -0,0 +1,141 @@
+import os
+import sys
+import time
+import tempfile
+import tracemalloc
+
+import numpy as np
+from PIL import Image
+
+from convert import convert_image_to_bin, convert_image_to_bin_loop
+from reverse_convert import convert_bin_to_image, convert_bin_to_image_loop
+from bin_to_text import bin_to_vhdl_mem, bin_to_vhdl_mem_loop
+from convert import image_to_rgb444
+from rle import RLEWriter, iter_frames
+
+def time_call(func, *args, repeat=3):
+    # Best of `repeat` runs, in seconds
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def peak_memory(func, *args):
+    # Peak Python/NumPy heap usage of one call, in bytes
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+def bench_convert(image_path):
+    with tempfile.TemporaryDirectory() as tmp:
+        loop_bin = os.path.join(tmp, 'loop.bin')
+        fast_bin = os.path.join(tmp, 'fast.bin')
+
+        t_loop = time_call(convert_image_to_bin_loop, image_path, loop_bin)
+        t_fast = time_call(convert_image_to_bin, image_path, fast_bin)
+
+        with open(loop_bin, 'rb') as a, open(fast_bin, 'rb') as b:
+            identical = a.read() == b.read()
+
+    print(f"convert_image_to_bin  loop: {t_loop*1000:8.1f} ms  "
+          f"vectorized: {t_fast*1000:8.1f} ms  speedup: {t_loop/t_fast:5.1f}x  "
+          f"byte-identical: {identical}")
+    if not identical:
+        raise SystemExit("Vectorized output differs from the reference loop")
+
+def bench_reverse(image_path):
+    with tempfile.TemporaryDirectory() as tmp:
+        bin_path = os.path.join(tmp, 'frame.bin')
+        loop_png = os.path.join(tmp, 'loop.png')
+        fast_png = os.path.join(tmp, 'fast.png')
+        convert_image_to_bin(image_path, bin_path)
+
+        t_loop = time_call(convert_bin_to_image_loop, bin_path, loop_png)
+        t_fast = time_call(convert_bin_to_image, bin_path, fast_png)
+        m_loop = peak_memory(convert_bin_to_image_loop, bin_path, loop_png)
+        m_fast = peak_memory(convert_bin_to_image, bin_path, fast_png)
+
+        identical = Image.open(loop_png).tobytes() == Image.open(fast_png).tobytes()
+
+    print(f"convert_bin_to_image  loop: {t_loop*1000:8.1f} ms  "
+          f"vectorized: {t_fast*1000:8.1f} ms  speedup: {t_loop/t_fast:5.1f}x  "
+          f"peak MB: {m_loop/2**20:.1f} -> {m_fast/2**20:.1f}  "
+          f"pixel-identical: {identical}")
+    if not identical:
+        raise SystemExit("Vectorized decoder differs from the reference loop")
+
+def bench_mem(frames=8):
+    # A synthetic preload image of `frames` 640x480 frames
+    with tempfile.TemporaryDirectory() as tmp:
+        bin_path = os.path.join(tmp, 'frames.bin')
+        loop_mem = os.path.join(tmp, 'loop.mem')
+        fast_mem = os.path.join(tmp, 'fast.mem')
+        with open(bin_path, 'wb') as f:
+            f.write(os.urandom(frames * 640 * 480 * 2))
+
+        t_loop = time_call(bin_to_vhdl_mem_loop, bin_path, loop_mem, repeat=1)
+        t_fast = time_call(bin_to_vhdl_mem, bin_path, fast_mem)
+        m_fast = peak_memory(bin_to_vhdl_mem, bin_path, fast_mem)
+        size_mb = os.path.getsize(bin_path) / 2**20
+
+        with open(loop_mem, 'rb') as a, open(fast_mem, 'rb') as b:
+            identical = a.read() == b.read()
+
+    print(f"bin_to_vhdl_mem       loop: {t_loop*1000:8.1f} ms  "
+          f"streaming: {t_fast*1000:8.1f} ms  speedup: {t_loop/t_fast:5.1f}x  "
+          f"{size_mb/t_fast:.0f} MB/s  peak MB: {m_fast/2**20:.1f}  "
+          f"byte-identical: {identical}")
+    if not identical:
+        raise SystemExit("Streaming .mem output differs from the reference loop")
+
+def animation_frames(image_path, frames=16):
+    # A slideshow-like sequence: a static background with a moving 64x64 sprite
+    background = image_to_rgb444(Image.open(image_path))
+    sequence = []
+    for i in range(frames):
+        frame = background.copy()
+        frame[200:264, 40 * i:40 * i + 64] = 0x0F00
+        sequence.append(frame)
+    return sequence
+
+def bench_rle(image_paths):
+    # Compression ratio and throughput on a set of images (or one animated image)
+    if len(image_paths) > 1:
+        sequence = [image_to_rgb444(Image.open(p)) for p in image_paths]
+    else:
+        sequence = animation_frames(image_paths[0])
+    raw_bytes = sum(f.nbytes for f in sequence)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rle_path = os.path.join(tmp, 'frames.rle')
+
+        def encode():
+            with RLEWriter(rle_path) as writer:
+                for frame in sequence:
+                    writer.write_frame(frame)
+
+        def decode():
+            return [f for f in iter_frames(rle_path)]
+
+        t_enc = time_call(encode)
+        t_dec = time_call(decode)
+        rle_bytes = os.path.getsize(rle_path)
+        exact = all(np.array_equal(a, b) for a, b in zip(sequence, decode()))
+
+    mb = raw_bytes / 2**20
+    print(f"rle container         {len(sequence)} frames  ratio: {raw_bytes/rle_bytes:5.1f}x  "
+          f"encode: {mb/t_enc:6.0f} MB/s  decode: {mb/t_dec:6.0f} MB/s  bit-exact: {exact}")
+    if not exact:
+        raise SystemExit("RLE decoder output differs from the raw frames")
+
+if __name__ == "__main__":
+    # Example usage: python benchmark.py [image ...]
+    images = sys.argv[1:] or ['me.jpg']
+    bench_convert(images[0])
+    bench_reverse(images[0])
+    bench_mem()
+    bench_rle(images)
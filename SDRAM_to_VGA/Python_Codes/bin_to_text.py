@@ -1,13 +1,69 @@
-def bin_to_vhdl_mem(bin_file_path, output_vhdl_mem_path):
-    with open(bin_file_path, 'rb') as f:
-        data = f.read()
-
-    with open(output_vhdl_mem_path, 'w') as out:
-        for i in range(0, len(data), 2):
-            word = int.from_bytes(data[i:i+2], byteorder='little')
-            out.write(f"{word:04X}\n")  # write as hex
-
-    print(f"VHDL-compatible memory file saved as {output_vhdl_mem_path}")
-
-# Example usage:
-bin_to_vhdl_mem("me_conv.bin", "image_data.mem")
+import numpy as np
+
+# "XXXX\n" for every possible 16-bit word, so a whole chunk is formatted with one lookup
+HEX_DIGITS = np.frombuffer(b"0123456789ABCDEF", dtype=np.uint8)
+_all_words = np.arange(0x10000, dtype=np.uint32)
+HEX_LINES = np.empty((0x10000, 5), dtype=np.uint8)
+for _digit in range(4):
+    HEX_LINES[:, _digit] = HEX_DIGITS[(_all_words >> (12 - 4 * _digit)) & 0x0F]
+HEX_LINES[:, 4] = ord("\n")
+
+MEM_LAYOUT = 2  # 2: 8-bit pixels packed two per line; bumped so older artifacts are rebuilt
+CHUNK_WORDS = 1 << 20  # 2 MB of .bin input per read, 5 MB of text per write
+
+def pack_bytes(words):
+    # 8-bit pixels (rgb332, gray8, palette8) two per 16-bit SDRAM word, the first one in
+    # the low byte as in the little-endian .bin; an odd trailing pixel is padded with 0
+    if len(words) % 2:
+        words = np.append(words, np.uint8(0))
+    return np.ascontiguousarray(words).view('<u2')
+
+def words_to_hex(words):
+    # Format an array of 8- or 16-bit words as the bytes of a .mem file, one SDRAM word per line
+    if words.dtype.itemsize == 1:
+        words = pack_bytes(words)
+    return HEX_LINES[words].tobytes()
+
+def write_vhdl_mem(words, output_vhdl_mem_path, chunk_words=CHUNK_WORDS):
+    # Write words that are already in memory (e.g. straight from convert.py)
+    words = words.reshape(-1)
+    chunk_words -= chunk_words % 2  # keep 8-bit pixel pairs within one chunk
+    with open(output_vhdl_mem_path, 'wb') as out:
+        for start in range(0, len(words), chunk_words):
+            out.write(words_to_hex(words[start:start + chunk_words]))
+
+def bin_to_vhdl_mem(bin_file_path, output_vhdl_mem_path, chunk_words=CHUNK_WORDS):
+    # Stream the .bin in fixed-size chunks so memory use stays flat for any image size.
+    # The bytes are read as 16-bit SDRAM words whatever the pixel format, so 8-bit
+    # formats come out two pixels per line like write_vhdl_mem
+    buffer = bytearray(2 * chunk_words)
+
+    with open(bin_file_path, 'rb') as f, open(output_vhdl_mem_path, 'wb') as out:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            if n % 2:
+                # Odd trailing byte: treat it as a word with a zero high byte
+                buffer[n] = 0
+                n += 1
+            words = np.frombuffer(buffer, dtype='<u2', count=n // 2)
+            out.write(words_to_hex(words))  # write as hex
+
+    print(f"VHDL-compatible memory file saved as {output_vhdl_mem_path}")
+
+def bin_to_vhdl_mem_loop(bin_file_path, output_vhdl_mem_path):
+    # Original per-word implementation, kept as the reference for benchmark.py
+    with open(bin_file_path, 'rb') as f:
+        data = f.read()
+
+    with open(output_vhdl_mem_path, 'w') as out:
+        for i in range(0, len(data), 2):
+            word = int.from_bytes(data[i:i+2], byteorder='little')
+            out.write(f"{word:04X}\n")  # write as hex
+
+    print(f"VHDL-compatible memory file saved as {output_vhdl_mem_path}")
+
+if __name__ == "__main__":
+    # Example usage:
+    bin_to_vhdl_mem("me_conv.bin", "image_data.mem")
@@ -0,0 +1,108 @@
+import hashlib
+import os
+import shutil
+import tempfile
+
+from bin_to_text import MEM_LAYOUT, write_vhdl_mem
+
+BIN_NAME = 'frame.bin'
+MEM_NAME = 'frame.mem'
+
+def hash_file(path, chunk_size=1 << 20):
+    # SHA-256 of the raw source bytes; the image itself is never decoded
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def cache_key(image_path, width, height, resample, pixel_format):
+    params = f"{width}x{height}-{resample}-{pixel_format}-mem{MEM_LAYOUT}"
+    return hashlib.sha256(f"{hash_file(image_path)}-{params}".encode()).hexdigest()
+
+class ConversionCache:
+    # On-disk cache of .bin/.mem artifacts, one directory per key.
+    # The directory mtime is the last access time, used for LRU eviction.
+
+    def __init__(self, cache_dir, max_bytes=1 << 30):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def get(self, key):
+        # Returns (bin_path, mem_path) on a hit, None on a miss
+        entry = self.entry_dir(key)
+        bin_path = os.path.join(entry, BIN_NAME)
+        mem_path = os.path.join(entry, MEM_NAME)
+        if not (os.path.exists(bin_path) and os.path.exists(mem_path)):
+            return None
+        try:
+            os.utime(entry)  # mark as most recently used
+        except FileNotFoundError:
+            return None  # evicted by another process meanwhile
+        return bin_path, mem_path
+
+    def put(self, key, words):
+        # Write both artifacts to a temporary directory, then rename it into place
+        # so concurrent workers never see a half-written entry
+        tmp = tempfile.mkdtemp(dir=self.cache_dir, prefix='.tmp-')
+        words.astype(words.dtype.newbyteorder('<')).tofile(os.path.join(tmp, BIN_NAME))
+        write_vhdl_mem(words, os.path.join(tmp, MEM_NAME))
+        return self.commit(key, tmp)
+
+    def put_files(self, key, bin_path, mem_path):
+        # Store artifacts that were just written elsewhere, a file copy instead of re-formatting
+        tmp = tempfile.mkdtemp(dir=self.cache_dir, prefix='.tmp-')
+        shutil.copyfile(bin_path, os.path.join(tmp, BIN_NAME))
+        shutil.copyfile(mem_path, os.path.join(tmp, MEM_NAME))
+        return self.commit(key, tmp)
+
+    def commit(self, key, tmp):
+        try:
+            os.rename(tmp, self.entry_dir(key))
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)  # another worker stored it first
+        self.evict()
+        return self.get(key)
+
+    def entries(self):
+        # [(last_access, size, path)] for every complete entry
+        result = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.startswith('.tmp-'):
+                continue
+            try:
+                size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+                result.append((os.path.getmtime(path), size, path))
+            except FileNotFoundError:
+                continue
+        return result
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        # Drop least recently used entries until the cache fits in max_bytes
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+if __name__ == "__main__":
+    # Example usage
+    from PIL import Image
+    from convert import image_to_rgb444
+
+    cache = ConversionCache('.conv_cache', max_bytes=256 << 20)
+    key = cache_key('me.jpg', 640, 480, 'BICUBIC', 'rgb444')
+    hit = cache.get(key)
+    if hit is None:
+        hit = cache.put(key, image_to_rgb444(Image.open('me.jpg')))
+    print(f"Cached artifacts: {hit}")
@@ -0,0 +1,177 @@
+import numpy as np
+
+# Pixel format registry shared by convert.py (encode) and reverse_convert.py (decode).
+# Every format maps an (H, W, 3) uint8 RGB array to an (H, W) array of SDRAM words
+# and back. The words are stored little-endian in the .bin file.
+
+FORMATS = {}
+
+def register_format(fmt):
+    FORMATS[fmt.name] = fmt
+    return fmt
+
+def get_format(name):
+    try:
+        return FORMATS[name]
+    except KeyError:
+        raise ValueError(f"Unknown pixel format {name!r}, expected one of {sorted(FORMATS)}") from None
+
+def bayer_matrix(order=3):
+    # (2**order x 2**order) ordered-dither index matrix, values 0 .. 4**order - 1
+    m = np.zeros((1, 1), dtype=np.int32)
+    for _ in range(order):
+        m = np.block([[4 * m, 4 * m + 2], [4 * m + 3, 4 * m + 1]])
+    return m
+
+BAYER_8 = bayer_matrix(3)
+
+def bayer_threshold(height, width):
+    # Per-pixel thresholds in (0, 1), tiled over the frame
+    t = (BAYER_8 + 0.5) / BAYER_8.size
+    reps = (-(-height // t.shape[0]), -(-width // t.shape[1]))
+    return np.tile(t, reps)[:height, :width].astype(np.float32)
+
+def expand_table(bits):
+    # n-bit code -> 8-bit value, spread over the full 0-255 range (4 bits: v * 17)
+    levels = (1 << bits) - 1
+    return ((np.arange(levels + 1) * 255 + levels // 2) // levels).astype(np.uint8)
+
+class PixelFormat:
+    name = None
+    dtype = '<u2'  # storage type of one word in the .bin file
+
+    @property
+    def word_size(self):
+        return np.dtype(self.dtype).itemsize
+
+    def encode(self, rgb, dither=False):
+        raise NotImplementedError
+
+    def decode(self, words):
+        raise NotImplementedError
+
+class PackedRGB(PixelFormat):
+    # Channels packed MSB-first as R, G, B with the given bit widths,
+    # e.g. RGB444 is 0000 RRRR GGGG BBBB
+
+    def __init__(self, name, bits, dtype='<u2'):
+        self.name = name
+        self.bits = bits
+        self.dtype = dtype
+        self.shifts = (bits[1] + bits[2], bits[2], 0)
+        self.tables = [expand_table(b) for b in bits]
+
+    def encode(self, rgb, dither=False):
+        height, width = rgb.shape[:2]
+        words = np.zeros((height, width), dtype=np.dtype(self.dtype).newbyteorder('='))
+        if dither:
+            threshold = bayer_threshold(height, width)
+
+        for channel, (bits, shift) in enumerate(zip(self.bits, self.shifts)):
+            if dither:
+                # Ordered dither on the decoded scale: round each value up to the next
+                # level with probability equal to its fractional part, so the local
+                # average of the decoded colour matches the source
+                levels = (1 << bits) - 1
+                value = rgb[..., channel] * (levels / 255) + threshold
+                code = np.minimum(value.astype(np.int32), levels)
+            else:
+                code = rgb[..., channel] >> (8 - bits)  # truncate to `bits`
+            words |= code.astype(words.dtype) << shift
+        return words
+
+    def decode(self, words):
+        # Channels are written one at a time through a single scratch buffer so the
+        # peak memory stays close to the size of the output image
+        rgb = np.empty(words.shape + (3,), dtype=np.uint8)
+        scratch = np.empty(words.shape, dtype=words.dtype.newbyteorder('='))
+
+        for channel, (bits, shift) in enumerate(zip(self.bits, self.shifts)):
+            np.right_shift(words, shift, out=scratch)
+            scratch &= (1 << bits) - 1
+            rgb[..., channel] = self.tables[channel][scratch]
+        return rgb
+
+class Gray8(PixelFormat):
+    name = 'gray8'
+    dtype = 'u1'
+
+    def encode(self, rgb, dither=False):
+        # ITU-R BT.601 luma; 8 bits already holds every level so dithering is a no-op
+        r, g, b = (rgb[..., c].astype(np.uint32) for c in range(3))
+        return ((299 * r + 587 * g + 114 * b + 500) // 1000).astype(np.uint8)
+
+    def decode(self, words):
+        return np.repeat(words[..., None], 3, axis=-1)
+
+def rgb_keys(rgb):
+    # (..., 3) uint8 RGB -> (...) 24-bit integer per colour
+    rgb = rgb.astype(np.uint32)
+    return (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+
+class PaletteFormat(PixelFormat):
+    # 8-bit index into a fixed palette of up to 256 RGB colours
+
+    dtype = 'u1'
+    LUT_BITS = 5  # nearest colour is looked up on a 32x32x32 RGB grid
+
+    def __init__(self, name, palette):
+        palette = np.asarray(palette, dtype=np.uint8).reshape(-1, 3)
+        if len(palette) > 256:
+            raise ValueError(f"Palette has {len(palette)} colours, at most 256 fit in one byte")
+        self.name = name
+        self.palette = palette
+        self._lut = None
+        # Exact colours: sorted 24-bit RGB keys and the first palette index of each
+        self.keys, self.key_index = np.unique(rgb_keys(palette), return_index=True)
+
+    @property
+    def lut(self):
+        # Built on first use: nearest palette index for the centre of every grid cell
+        if self._lut is None:
+            cells = 1 << self.LUT_BITS
+            step = 256 // cells
+            axis = np.arange(cells) * step + step // 2
+            grid = np.stack(np.meshgrid(axis, axis, axis, indexing='ij'), -1).reshape(-1, 3)
+            pal = self.palette.astype(np.int32)
+
+            lut = np.empty(len(grid), dtype=np.uint8)
+            for start in range(0, len(grid), 4096):
+                block = grid[start:start + 4096, None, :] - pal[None, :, :]
+                lut[start:start + 4096] = np.argmin((block * block).sum(-1), axis=1)
+            self._lut = lut.reshape(cells, cells, cells)
+        return self._lut
+
+    def encode(self, rgb, dither=False):
+        shift = 8 - self.LUT_BITS
+        if dither:
+            # Centred ordered dither, scaled to the typical spacing between palette colours
+            step = 256 / round(len(self.palette) ** (1 / 3))
+            offset = (bayer_threshold(*rgb.shape[:2]) - 0.5) * step
+            rgb = np.clip(rgb + offset[..., None], 0, 255).astype(np.uint8)
+        idx = rgb >> shift
+        words = self.lut[idx[..., 0], idx[..., 1], idx[..., 2]]
+
+        # The grid only holds the nearest colour to each cell centre, so colours that
+        # are in the palette are looked up exactly and always encode to their own index
+        keys = rgb_keys(rgb)
+        pos = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        exact = self.keys[pos] == keys
+        words[exact] = self.key_index[pos[exact]]
+        return words
+
+    def decode(self, words):
+        return self.palette[words]
+
+def default_palette():
+    # 6x6x6 colour cube followed by a 40-step gray ramp (256 colours)
+    levels = np.array([0, 51, 102, 153, 204, 255], dtype=np.uint8)
+    cube = np.stack(np.meshgrid(levels, levels, levels, indexing='ij'), -1).reshape(-1, 3)
+    gray = np.linspace(0, 255, 42)[1:-1].round().astype(np.uint8)
+    return np.concatenate([cube, np.repeat(gray[:, None], 3, axis=1)])
+
+register_format(PackedRGB('rgb444', (4, 4, 4)))
+register_format(PackedRGB('rgb565', (5, 6, 5)))
+register_format(PackedRGB('rgb332', (3, 3, 2), dtype='u1'))
+register_format(Gray8())
+register_format(PaletteFormat('palette8', default_palette()))
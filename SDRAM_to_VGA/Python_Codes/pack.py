@@ -0,0 +1,128 @@
+import argparse
+import json
+import os
+
+import numpy as np
+
+from formats import get_format
+
+SDRAM_ADDRESS_BITS = 25   # sdram_s1_address(24 downto 0) in main2.vhd, one address per 16-bit word
+SDRAM_ROW_WORDS = 1024    # one SDRAM row, the default frame alignment
+COPY_CHUNK = 1 << 20      # bytes copied per read while packing
+
+def align_up(value, align):
+    return -(-value // align) * align
+
+def index_path_for(pack_path):
+    return os.path.splitext(pack_path)[0] + '.json'
+
+def pack_frames(bin_paths, output_path, width=640, height=480, pixel_format='rgb444',
+                align_words=SDRAM_ROW_WORDS, index_path=None, vhdl_path=None):
+    # Lay the frames out back to back in one SDRAM image, each starting on an
+    # `align_words` boundary, and return the base word address of every frame
+    fmt = get_format(pixel_format)
+    frame_bytes = width * height * fmt.word_size
+    frame_words = -(-frame_bytes // 2)  # 8-bit formats hold two pixels per SDRAM word
+
+    bases = []
+    address = 0
+    with open(output_path, 'wb') as out:
+        for path in bin_paths:
+            size = os.path.getsize(path)
+            if size != frame_bytes:
+                raise ValueError(f"{path}: expected {frame_bytes} bytes, got {size}")
+
+            # Zero padding up to the next aligned base address
+            base = align_up(address, align_words)
+            out.write(bytes(2 * (base - address)))
+            bases.append(base)
+
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(COPY_CHUNK), b''):
+                    out.write(chunk)
+            if frame_bytes % 2:
+                out.write(b'\x00')
+            address = base + frame_words
+
+    if address > 1 << SDRAM_ADDRESS_BITS:
+        raise ValueError(f"Packed image needs {address} words, the {SDRAM_ADDRESS_BITS}-bit "
+                         f"SDRAM address bus reaches {1 << SDRAM_ADDRESS_BITS}")
+
+    index = {
+        'width': width,
+        'height': height,
+        'pixel_format': pixel_format,
+        'frame_words': frame_words,
+        'align_words': align_words,
+        'total_words': address,
+        'base_addresses': bases,
+    }
+    with open(index_path or index_path_for(output_path), 'w') as f:
+        json.dump(index, f, indent=2)
+    if vhdl_path:
+        write_vhdl_index(bases, vhdl_path)
+
+    print(f"Packed {len(bases)} frame(s) ({address} words) into {output_path}")
+    return bases
+
+def write_vhdl_index(bases, vhdl_path, package_name='frame_index'):
+    # Frame base addresses as a constant array for the sdram_s1_address bus
+    lines = [
+        "library ieee;",
+        "use ieee.std_logic_1164.all;",
+        "",
+        f"package {package_name} is",
+        f"constant FRAME_COUNT: natural := {len(bases)};",
+        f"type frame_addr_array is array (0 to FRAME_COUNT-1) of std_logic_vector({SDRAM_ADDRESS_BITS - 1} downto 0);",
+        "constant FRAME_BASE: frame_addr_array := (",
+    ]
+    for i, base in enumerate(bases):
+        sep = ',' if i < len(bases) - 1 else ''
+        lines.append(f'{i} => "{base:0{SDRAM_ADDRESS_BITS}b}"{sep} -- 0x{base:07X}')
+    lines += [");", f"end package {package_name};", ""]
+
+    with open(vhdl_path, 'w') as f:
+        f.write("\n".join(lines))
+
+class FramePack:
+    # Random access to the frames of a packed SDRAM image through a memory map,
+    # so a single frame can be checked without loading the whole image
+
+    def __init__(self, pack_path, index_path=None):
+        with open(index_path or index_path_for(pack_path)) as f:
+            self.index = json.load(f)
+        self.width = self.index['width']
+        self.height = self.index['height']
+        self.format = get_format(self.index['pixel_format'])
+        self.bases = self.index['base_addresses']
+        self.data = np.memmap(pack_path, dtype=np.uint8, mode='r')
+
+    def __len__(self):
+        return len(self.bases)
+
+    def frame_words(self, i):
+        # (height, width) view of frame `i`, nothing is read until it is used
+        start = 2 * self.bases[i]
+        count = self.width * self.height * self.format.word_size
+        return self.data[start:start + count].view(self.format.dtype).reshape(self.height, self.width)
+
+    def frame_rgb(self, i):
+        return self.format.decode(self.frame_words(i))
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack .bin frames into one SDRAM image")
+    parser.add_argument('frames', nargs='+', help=".bin frames in playback order")
+    parser.add_argument('-o', '--output', required=True, help="packed SDRAM image")
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    parser.add_argument('--format', default='rgb444', help="pixel format of the frames")
+    parser.add_argument('--align', type=int, default=SDRAM_ROW_WORDS, help="frame alignment in words")
+    parser.add_argument('--vhdl', default=None, help="also write the index as a VHDL package")
+    args = parser.parse_args()
+
+    pack_frames(args.frames, args.output, args.width, args.height, args.format,
+                args.align, vhdl_path=args.vhdl)
+
+if __name__ == "__main__":
+    # Example usage: python pack.py out/*_conv.bin -o slideshow.bin --vhdl frame_index.vhd
+    main()
@@ -0,0 +1,158 @@
+import argparse
+import struct
+
+import numpy as np
+from PIL import Image
+
+from convert import image_to_words
+from formats import get_format
+
+# Compressed frame container (.rle), decoded bit-exact to the raw .bin frames.
+#
+#   file header : magic 'RLEV', version u8, width u16, height u16, pixel format (8 bytes)
+#   frame header: frame type u8, run count u32, payload bytes u32
+#   KEY   payload: run lengths (u16[runs]) + run values (word[runs]) of the frame
+#   DELTA payload: same, for the frame XOR the previous frame (static areas become zero runs)
+#   RAW   payload: the frame words as-is, used when run-length coding would not shrink it
+
+MAGIC = b'RLEV'
+VERSION = 1
+FILE_HEADER = struct.Struct('<4sBHH8s')
+FRAME_HEADER = struct.Struct('<BII')
+KEY, DELTA, RAW = 0, 1, 2
+MAX_RUN = 0xFFFF
+
+def rle_encode(words):
+    # Run-length encode a flat word array, returns (lengths u16, values)
+    n = len(words)
+    if n == 0:
+        return np.zeros(0, '<u2'), words[:0]
+    starts = np.concatenate(([0], np.flatnonzero(words[1:] != words[:-1]) + 1))
+    lengths = np.diff(np.append(starts, n))
+    values = words[starts]
+
+    if lengths.max() > MAX_RUN:
+        # Split long runs into MAX_RUN pieces plus a remainder
+        pieces = -(-lengths // MAX_RUN)
+        values = np.repeat(values, pieces)
+        piece_lengths = np.full(pieces.sum(), MAX_RUN, dtype=np.int64)
+        last = np.cumsum(pieces) - 1
+        piece_lengths[last] = lengths - (pieces - 1) * MAX_RUN
+        lengths = piece_lengths
+    return lengths.astype('<u2'), values
+
+def rle_decode(lengths, values):
+    return np.repeat(values, lengths.astype(np.int64))
+
+def encode_frame(words, previous=None):
+    # Pick the smallest of KEY, DELTA (if there is a previous frame) and RAW
+    dtype = words.dtype
+    candidates = []
+    for frame_type, source in ((KEY, words), (DELTA, None if previous is None else words ^ previous)):
+        if source is None:
+            continue
+        lengths, values = rle_encode(source)
+        payload = lengths.tobytes() + values.astype(dtype).tobytes()
+        candidates.append((len(payload), frame_type, len(lengths), payload))
+    candidates.append((words.nbytes, RAW, 0, words.tobytes()))
+
+    _, frame_type, runs, payload = min(candidates, key=lambda c: c[0])
+    return FRAME_HEADER.pack(frame_type, runs, len(payload)) + payload
+
+class RLEWriter:
+    def __init__(self, output_path, width=640, height=480, pixel_format='rgb444'):
+        self.format = get_format(pixel_format)
+        self.width = width
+        self.height = height
+        self.previous = None
+        self.frames = 0
+        self.file = open(output_path, 'wb')
+        self.file.write(FILE_HEADER.pack(MAGIC, VERSION, width, height, pixel_format.encode()))
+
+    def write_frame(self, words):
+        words = np.ascontiguousarray(words, dtype=self.format.dtype).reshape(-1)
+        if len(words) != self.width * self.height:
+            raise ValueError(f"Frame has {len(words)} pixels, expected {self.width * self.height}")
+        self.file.write(encode_frame(words, self.previous))
+        self.previous = words
+        self.frames += 1
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def iter_frames(rle_path):
+    # Streaming decoder: yields one (height, width) word array per frame,
+    # only the current and previous frame are held in memory
+    with open(rle_path, 'rb') as f:
+        magic, version, width, height, name = FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{rle_path} is not a version {VERSION} RLE frame file")
+        dtype = get_format(name.rstrip(b'\0').decode()).dtype
+        word_size = np.dtype(dtype).itemsize
+
+        previous = None
+        while True:
+            header = f.read(FRAME_HEADER.size)
+            if not header:
+                break
+            frame_type, runs, payload_size = FRAME_HEADER.unpack(header)
+            payload = f.read(payload_size)
+
+            if frame_type == RAW:
+                words = np.frombuffer(payload, dtype=dtype)
+            else:
+                lengths = np.frombuffer(payload, dtype='<u2', count=runs)
+                values = np.frombuffer(payload, dtype=dtype, count=runs, offset=2 * runs)
+                words = rle_decode(lengths, values)
+            # Checked before the XOR: a DELTA frame needs a previous frame of the same size
+            if len(words) != width * height or (frame_type == DELTA and previous is None):
+                raise ValueError(f"{rle_path}: corrupt frame")
+            if frame_type == DELTA:
+                words = words ^ previous
+
+            previous = words
+            yield words.reshape(height, width)
+
+def compress_bin_files(bin_paths, output_path, width=640, height=480, pixel_format='rgb444'):
+    dtype = get_format(pixel_format).dtype
+    with RLEWriter(output_path, width, height, pixel_format) as writer:
+        for path in bin_paths:
+            writer.write_frame(np.fromfile(path, dtype=dtype))
+    print(f"Compressed {writer.frames} frame(s) into {output_path}")
+
+def convert_images_to_rle(image_paths, output_path, width=640, height=480,
+                          resample=Image.BICUBIC, pixel_format='rgb444', dither=False):
+    # Same conversion as convert_image_to_bin, written to one compressed file
+    with RLEWriter(output_path, width, height, pixel_format) as writer:
+        for path in image_paths:
+            writer.write_frame(image_to_words(Image.open(path), width, height, resample,
+                                              pixel_format, dither))
+    print(f"Compressed {writer.frames} frame(s) into {output_path}")
+
+def decompress_to_bin(rle_path, output_bin_path):
+    # Frames back to back, byte-identical to the raw .bin files they came from
+    with open(output_bin_path, 'wb') as out:
+        for words in iter_frames(rle_path):
+            out.write(words.tobytes())
+    print(f"Binary file saved as {output_bin_path}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compress .bin frames into one RLE/delta file")
+    parser.add_argument('frames', nargs='+', help=".bin frames in playback order")
+    parser.add_argument('-o', '--output', required=True, help="compressed .rle file")
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    parser.add_argument('--format', default='rgb444', help="pixel format of the frames")
+    args = parser.parse_args()
+
+    compress_bin_files(args.frames, args.output, args.width, args.height, args.format)
+
+if __name__ == "__main__":
+    # Example usage: python rle.py out/*_conv.bin -o slideshow.rle
+    main()
@@ -0,0 +1,125 @@
+import argparse
+import os
+import re
+import time
+
+import numpy as np
+from PIL import Image
+
+from formats import get_format
+
+# Cycle-accurate model of the VGA_IP.vhd scanout, one array element per 25 MHz pixel clock.
+# The timing constants are read from the VHDL so the model follows any change to it.
+
+VGA_IP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'VGA_IP.vhd')
+
+DEFAULT_TIMING = {
+    'H_VISIBLE': 640, 'H_FRONT': 16, 'H_SYNC': 96, 'H_BACK': 48,
+    'V_VISIBLE': 480, 'V_FRONT': 10, 'V_SYNC': 2, 'V_BACK': 33,
+}
+
+def read_timing(vhdl_path=VGA_IP_PATH):
+    # `constant H_VISIBLE : integer := 640;` style lines, totals are derived as in the VHDL
+    timing = dict(DEFAULT_TIMING)
+    if os.path.exists(vhdl_path):
+        with open(vhdl_path) as f:
+            for name, value in re.findall(r'constant\s+(\w+)\s*:\s*integer\s*:=\s*(\d+)\s*;', f.read()):
+                if name in timing:
+                    timing[name] = int(value)
+    timing['H_TOTAL'] = timing['H_VISIBLE'] + timing['H_FRONT'] + timing['H_SYNC'] + timing['H_BACK']
+    timing['V_TOTAL'] = timing['V_VISIBLE'] + timing['V_FRONT'] + timing['V_SYNC'] + timing['V_BACK']
+    return timing
+
+TIMING = read_timing()
+
+class VGAModel:
+    def __init__(self, timing=TIMING):
+        self.timing = timing
+        t = timing
+        h = np.arange(t['H_TOTAL'])
+        v = np.arange(t['V_TOTAL'])
+
+        # pixel_active, hsync and vsync exactly as the concurrent statements in VGA_IP.vhd
+        h_active = h < t['H_VISIBLE']
+        v_active = v < t['V_VISIBLE']
+        h_sync_start = t['H_VISIBLE'] + t['H_FRONT']
+        v_sync_start = t['V_VISIBLE'] + t['V_FRONT']
+        h_pulse = (h >= h_sync_start) & (h < h_sync_start + t['H_SYNC'])
+        v_pulse = (v >= v_sync_start) & (v < v_sync_start + t['V_SYNC'])
+
+        shape = (t['V_TOTAL'], t['H_TOTAL'])
+        self.pixel_active = v_active[:, None] & h_active[None, :]
+        self.hsync = np.broadcast_to((~h_pulse).astype(np.uint8)[None, :], shape)  # active low
+        self.vsync = np.broadcast_to((~v_pulse).astype(np.uint8)[:, None], shape)  # active low
+
+    def scanout(self, words, pipeline_delay=1):
+        # Full V_TOTAL x H_TOTAL raster of the 12-bit {R,G,B} outputs for one frame.
+        #
+        # data_reg is loaded on every active clock and the outputs show data_reg, so
+        # each visible pixel shows the word presented `pipeline_delay` active clocks
+        # earlier (the first pixels show the tail of the previous, identical, frame).
+        # Use pipeline_delay=0 for an ideal, latency-free source.
+        t = self.timing
+        data_in = np.asarray(words).reshape(-1) & 0x0FFF
+        expected = t['H_VISIBLE'] * t['V_VISIBLE']
+        if len(data_in) != expected:
+            raise ValueError(f"Frame has {len(data_in)} pixels, expected {expected}")
+
+        raster = np.zeros((t['V_TOTAL'], t['H_TOTAL']), dtype=np.uint16)
+        raster[:t['V_VISIBLE'], :t['H_VISIBLE']] = np.roll(data_in, pipeline_delay).reshape(
+            t['V_VISIBLE'], t['H_VISIBLE'])
+        return raster
+
+    def waveforms(self, words, pipeline_delay=1):
+        # Per-clock red, green, blue, hsync and vsync, each V_TOTAL x H_TOTAL
+        raster = self.scanout(words, pipeline_delay)
+        return {
+            'red': (raster >> 8) & 0x0F,
+            'green': (raster >> 4) & 0x0F,
+            'blue': raster & 0x0F,
+            'hsync': self.hsync,
+            'vsync': self.vsync,
+        }
+
+    def visible_rgb(self, raster):
+        # What the monitor displays, as 8-bit RGB like reverse_convert.py produces
+        t = self.timing
+        return get_format('rgb444').decode(raster[:t['V_VISIBLE'], :t['H_VISIBLE']])
+
+def compare_bin_to_image(bin_file_path, image_path, pipeline_delay=1, model=None):
+    # Number of visible pixels where the modelled monitor output differs from the image
+    model = model or VGAModel()
+    words = np.fromfile(bin_file_path, dtype='<u2')
+    shown = model.visible_rgb(model.scanout(words, pipeline_delay))
+    reference = np.asarray(Image.open(image_path).convert('RGB'))
+    if reference.shape != shown.shape:
+        raise ValueError(f"Image is {reference.shape[1]}x{reference.shape[0]}, "
+                         f"the VGA frame is {shown.shape[1]}x{shown.shape[0]}")
+    return int(np.any(shown != reference, axis=-1).sum())
+
+def main():
+    parser = argparse.ArgumentParser(description="Model the VGA_IP.vhd scanout of .bin frames")
+    parser.add_argument('bin', help="RGB444 .bin frame")
+    parser.add_argument('image', nargs='?', help="reverse_convert.py output to diff against")
+    parser.add_argument('--delay', type=int, default=1, help="pixel pipeline delay in clocks")
+    args = parser.parse_args()
+
+    model = VGAModel()
+    start = time.perf_counter()
+    words = np.fromfile(args.bin, dtype='<u2')
+    waves = model.waveforms(words, args.delay)
+    elapsed = time.perf_counter() - start
+    t = model.timing
+    print(f"{t['H_TOTAL']}x{t['V_TOTAL']} raster in {elapsed*1000:.2f} ms, "
+          f"hsync low {int((waves['hsync'][0] == 0).sum())} clocks/line, "
+          f"vsync low {int((waves['vsync'][:, 0] == 0).sum())} lines/frame")
+
+    if args.image:
+        mismatches = compare_bin_to_image(args.bin, args.image, args.delay, model)
+        print(f"{mismatches} visible pixel(s) differ from {args.image}")
+        if mismatches:
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    # Example usage: python vga_model.py me_conv.bin output_image_reverse.png --delay 0
+    main()
@@ -0,0 +1,167 @@
+import argparse
+import json
+import os
+
+import numpy as np
+from PIL import Image
+
+from formats import get_format
+
+# Lazy access to .bin/.mem artifacts: only the rows of a requested tile are read
+# and decoded, so large multi-frame images can be inspected without a full decode.
+
+# ASCII hex digit -> value, anything else -> 255
+HEX_VALUES = np.full(256, 255, dtype=np.uint8)
+for _i, _c in enumerate(b"0123456789ABCDEF"):
+    HEX_VALUES[_c] = _i
+    HEX_VALUES[ord(chr(_c).lower())] = _i
+
+class Artifact:
+    # Frames of width x height pixels; subclasses provide words(start, count)
+
+    def __init__(self, path, width=640, height=480, pixel_format='rgb444'):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.format = get_format(pixel_format)
+        self.frame_pixels = width * height
+        self.frame_starts = None  # pixel offset of every frame, None for back-to-back frames
+
+    def frame_start(self, frame):
+        if self.frame_starts is not None:
+            return self.frame_starts[frame]
+        return frame * self.frame_pixels
+
+    def frame_count(self):
+        if self.frame_starts is not None:
+            return len(self.frame_starts)
+        return self.pixel_count() // self.frame_pixels
+
+    def tile_words(self, frame=0, x=0, y=0, w=None, h=None):
+        # Only rows y .. y+h of the frame are read
+        w = self.width - x if w is None else w
+        h = self.height - y if h is None else h
+        if not (0 <= x and x + w <= self.width and 0 <= y and y + h <= self.height):
+            raise ValueError(f"Tile {w}x{h}+{x}+{y} is outside the {self.width}x{self.height} frame")
+        if not 0 <= frame < self.frame_count():
+            raise IndexError(f"Frame {frame} out of range, {self.path} has {self.frame_count()}")
+        start = self.frame_start(frame) + y * self.width
+        rows = self.words(start, h * self.width).reshape(h, self.width)
+        return rows[:, x:x + w]
+
+    def tile_rgb(self, frame=0, x=0, y=0, w=None, h=None):
+        return self.format.decode(np.ascontiguousarray(self.tile_words(frame, x, y, w, h)))
+
+    def rows_rgb(self, frame, first, last):
+        return self.tile_rgb(frame, 0, first, None, last - first)
+
+class BinArtifact(Artifact):
+    def __init__(self, path, width=640, height=480, pixel_format='rgb444', index_path=None):
+        super().__init__(path, width, height, pixel_format)
+        self.data = np.memmap(path, dtype=np.uint8, mode='r')
+
+        # Packed SDRAM images (pack.py) carry their frame base addresses in a JSON index
+        index_path = index_path or os.path.splitext(path)[0] + '.json'
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                index = json.load(f)
+            if 'base_addresses' in index:
+                # Base addresses are in 16-bit SDRAM words
+                self.frame_starts = [2 * base // self.format.word_size for base in index['base_addresses']]
+
+    def pixel_count(self):
+        return len(self.data) // self.format.word_size
+
+    def words(self, start, count):
+        size = self.format.word_size
+        return self.data[start * size:(start + count) * size].view(self.format.dtype)
+
+class MemArtifact(Artifact):
+    # .mem text with one fixed-width hex word per line, parsed only where it is read.
+    # Every line is a 16-bit SDRAM word: two pixels for 8-bit formats, low byte first
+
+    def __init__(self, path, width=640, height=480, pixel_format='rgb444'):
+        super().__init__(path, width, height, pixel_format)
+        self.data = np.memmap(path, dtype=np.uint8, mode='r')
+
+        first_newline = int(np.argmax(self.data[:64] == ord('\n')))
+        if self.data[first_newline] != ord('\n'):
+            raise ValueError(f"{path} does not look like a .mem file")
+        self.line_length = first_newline + 1
+        self.digits = first_newline - (1 if first_newline and self.data[first_newline - 1] == ord('\r') else 0)
+        if len(self.data) % self.line_length:
+            raise ValueError(f"{path}: lines are not all {self.line_length} bytes long")
+        self.per_line = 2 // self.format.word_size  # pixels per SDRAM word
+
+    def pixel_count(self):
+        return len(self.data) // self.line_length * self.per_line
+
+    def words(self, start, count):
+        first, end = start // self.per_line, -(-(start + count) // self.per_line)
+        lines = self.data[first * self.line_length:end * self.line_length]
+        digits = HEX_VALUES[lines.reshape(-1, self.line_length)[:, :self.digits]]
+        if np.any(digits == 255):
+            raise ValueError(f"{self.path}: invalid hex digit near line {first + 1}")
+        words = np.zeros(len(digits), dtype=np.uint16)
+        for column in range(self.digits):
+            words = (words << 4) | digits[:, column]
+        if self.per_line == 1:
+            return words.astype(self.format.dtype)
+        skip = start - first * self.per_line
+        return words.astype('<u2').view(self.format.dtype)[skip:skip + count]
+
+def open_artifact(path, width=640, height=480, pixel_format='rgb444'):
+    if path.lower().endswith('.mem'):
+        return MemArtifact(path, width, height, pixel_format)
+    return BinArtifact(path, width, height, pixel_format)
+
+def diff_tiles(a, b, frame=0, x=0, y=0, w=None, h=None, frame_b=None):
+    # Per-pixel diff of the same tile in two artifacts:
+    # returns the mismatch mask and the largest per-channel difference
+    rgb_a = a.tile_rgb(frame, x, y, w, h).astype(np.int16)
+    rgb_b = b.tile_rgb(frame if frame_b is None else frame_b, x, y, w, h).astype(np.int16)
+    delta = np.abs(rgb_a - rgb_b)
+    return delta.max(axis=-1) > 0, int(delta.max(initial=0))
+
+def diff_image(mask, rgb):
+    # The tile dimmed to a quarter, with differing pixels in bright red
+    out = rgb // 4
+    out[mask] = (255, 0, 0)
+    return Image.fromarray(out, 'RGB')
+
+def main():
+    parser = argparse.ArgumentParser(description="View or diff tiles of .bin/.mem artifacts")
+    parser.add_argument('artifact', help=".bin or .mem file")
+    parser.add_argument('other', nargs='?', help="second artifact to diff against")
+    parser.add_argument('--frame', type=int, default=0)
+    parser.add_argument('--tile', default=None, help="WxH+X+Y, default the whole frame")
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    parser.add_argument('--format', default='rgb444', help="pixel format of the artifacts")
+    parser.add_argument('-o', '--output', default=None, help="save the tile (or the diff) as an image")
+    args = parser.parse_args()
+
+    x = y = 0
+    w = h = None
+    if args.tile:
+        size, x, y = args.tile.split('+')
+        w, h = (int(v) for v in size.split('x'))
+        x, y = int(x), int(y)
+
+    a = open_artifact(args.artifact, args.width, args.height, args.format)
+    rgb = a.tile_rgb(args.frame, x, y, w, h)
+
+    if args.other:
+        b = open_artifact(args.other, args.width, args.height, args.format)
+        mask, max_delta = diff_tiles(a, b, args.frame, x, y, w, h)
+        print(f"{int(mask.sum())} of {mask.size} pixel(s) differ, max channel delta {max_delta}")
+        if args.output:
+            diff_image(mask, rgb).save(args.output)
+    else:
+        print(f"{a.path}: {a.frame_count()} frame(s), tile {rgb.shape[1]}x{rgb.shape[0]}")
+        if args.output:
+            Image.fromarray(rgb, 'RGB').save(args.output)
+
+if __name__ == "__main__":
+    # Example usage: python viewer.py me_conv.bin image_data.mem --tile 64x64+320+240 -o diff.png
+    main()
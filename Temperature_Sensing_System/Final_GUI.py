@@ -1,27 +1,33 @@
 # This GUI was made by Eng. Haitham Ramadan
 # https://www.linkedin.com/in/haitham-ramadan-alyamani/
 import sys
-import os
 import time
 import serial
-import serial.tools.list_ports
 import threading
 import numpy as np
 from datetime import datetime
 from collections import deque
-import pandas as pd
+
+from data_logger import DataLogger, BackgroundLogWriter
+from history import TemperatureHistory
+from serial_reader import Backoff
+from telemetry import TelemetryReader
+from calibration import CalibrationStore
+from publisher import SamplePublisher
+from port_watcher import shared_watcher
 
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                            QHBoxLayout, QComboBox, QPushButton, QLabel, 
                            QFrame, QSpinBox, QSplitter, QGridLayout)
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QObject, QSize, QRect  # Added QRect
-from PyQt5.QtGui import QPainter, QColor, QFont, QPen, QBrush, QRadialGradient, QLinearGradient, QPainterPath
+from PyQt5.QtGui import QPainter, QColor, QFont, QPen, QBrush, QRadialGradient, QLinearGradient, QPainterPath, QPixmap
 
 
 import matplotlib
 matplotlib.use('Qt5Agg')
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter, MaxNLocator
 
 # Dark theme color palette - Enhanced vibrant colors
 DARK_BG = "#0f111a"  # Darker background
@@ -50,31 +56,42 @@ class TemperatureGauge(QWidget):
         self.max_temp = 100
         self.unit = "°C"
         
-        # For smooth animation
+        # For smooth animation, only runs while the needle is moving
         self.display_temp = 0.0
         self.animation_timer = QTimer()
         self.animation_timer.timeout.connect(self.update_animation)
-        self.animation_timer.start(16)  # ~60 FPS
+        
+        # Static dial (rim, gradient, scale marks, labels), rebuilt on resize or set_range
+        self.dial_cache = None
         
     def update_animation(self):
         # Smooth animation
         diff = self.temperature - self.display_temp
         if abs(diff) > 0.1:
             self.display_temp += diff * 0.1
-            self.update()
-        elif self.display_temp != self.temperature:
+        else:
             self.display_temp = self.temperature
-            self.update()
+            self.animation_timer.stop()  # Converged: idle until the next reading
+        self.update()
             
     def set_temperature(self, temp, unit="°C"):
         self.temperature = temp
-        self.unit = unit
+        if unit != self.unit:
+            self.unit = unit
+            self.update()
+        if self.display_temp != self.temperature and not self.animation_timer.isActive():
+            self.animation_timer.start(16)  # ~60 FPS
         
     def set_range(self, min_temp, max_temp):
         self.min_temp = min_temp
         self.max_temp = max_temp
+        self.dial_cache = None
         self.update()
         
+    def resizeEvent(self, event):
+        self.dial_cache = None
+        super().resizeEvent(event)
+        
     def get_color(self, temp):
         # Map temperature to color
         if temp < 20:
@@ -86,45 +103,31 @@ class TemperatureGauge(QWidget):
         else:
             return QColor(HOT_COLOR)
         
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
+    def geometry_params(self):
+        # Digital display height, dial centre and radius for the current size
         width = self.width()
         height = self.height()
-        center_x = width / 2
-        center_y = height / 2
-        
-        # Digital display area (top part)
         digital_height = 50
-        display_rect = QRect(0, 0, width, digital_height)
-        
-        # Draw digital display background
-        painter.setPen(Qt.NoPen)
-        painter.setBrush(QColor(DARK_CARD_BG))
-        painter.drawRect(display_rect)
+        gauge_center_y = digital_height + (height - digital_height) / 2
+        radius = min(width, height - digital_height) * 0.4
+        return digital_height, width / 2, gauge_center_y, radius
         
-        # Draw digital temperature
-        temp_text = f"{self.display_temp:.1f}{self.unit}"
-        temp_color = self.get_color(self.display_temp)
+    def render_dial(self):
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
         
-        # Create a modern digital font
-        digital_font = QFont("Arial", 24, QFont.Bold)
-        painter.setFont(digital_font)
-        text_width = painter.fontMetrics().boundingRect(temp_text).width()
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
         
-        # Draw digital temperature with glow effect
-        painter.setPen(QPen(QColor(DARK_BG), 2))  # Shadow for depth
-        painter.drawText(int(center_x - text_width/2 + 2), 
-                        int(digital_height/2 + 8 + 2), temp_text)
-                        
-        painter.setPen(QPen(temp_color, 1))  # Use temperature color
-        painter.drawText(int(center_x - text_width/2), 
-                        int(digital_height/2 + 8), temp_text)
+        width = self.width()
+        digital_height, center_x, gauge_center_y, radius = self.geometry_params()
         
-        # Gauge size and position (below digital display)
-        gauge_center_y = digital_height + (height - digital_height) / 2
-        radius = min(width, height - digital_height) * 0.4
+        # Draw digital display background
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(DARK_CARD_BG))
+        painter.drawRect(QRect(0, 0, width, digital_height))
         
         # Draw outer rim
         painter.setPen(QPen(QColor(ACCENT_COLOR).darker(120), 8))
@@ -163,6 +166,39 @@ class TemperatureGauge(QWidget):
                 text_y = int(gauge_center_y + (radius - 30) * np.sin(rad_angle) + 5)
                 painter.drawText(text_x, text_y, f"{int(label_value)}")
         
+        painter.end()
+        return pixmap
+        
+    def paintEvent(self, event):
+        if self.dial_cache is None:
+            self.dial_cache = self.render_dial()
+        
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.drawPixmap(0, 0, self.dial_cache)
+        
+        height = self.height()
+        center_y = height / 2
+        digital_height, center_x, gauge_center_y, radius = self.geometry_params()
+        
+        # Draw digital temperature
+        temp_text = f"{self.display_temp:.1f}{self.unit}"
+        temp_color = self.get_color(self.display_temp)
+        
+        # Create a modern digital font
+        digital_font = QFont("Arial", 24, QFont.Bold)
+        painter.setFont(digital_font)
+        text_width = painter.fontMetrics().boundingRect(temp_text).width()
+        
+        # Draw digital temperature with glow effect
+        painter.setPen(QPen(QColor(DARK_BG), 2))  # Shadow for depth
+        painter.drawText(int(center_x - text_width/2 + 2), 
+                        int(digital_height/2 + 8 + 2), temp_text)
+                        
+        painter.setPen(QPen(temp_color, 1))  # Use temperature color
+        painter.drawText(int(center_x - text_width/2), 
+                        int(digital_height/2 + 8), temp_text)
+        
         # Calculate needle angle
         temp_ratio = (self.display_temp - self.min_temp) / (self.max_temp - self.min_temp)
         temp_ratio = max(0, min(1, temp_ratio))  # Clamp between 0 and 1
@@ -213,7 +249,11 @@ class TemperatureGauge(QWidget):
                         int(center_y + radius + 40), temp_text)
 
 class TemperatureGraph(FigureCanvas):
-    def __init__(self, parent=None, width=5, height=4, dpi=100):
+    # Selectable history windows: label -> seconds
+    SPANS = {"1 min": 60, "10 min": 600, "1 hour": 3600, "1 day": 86400, "1 week": 604800}
+    MAX_POINTS = 600  # points drawn per frame, whatever the span
+    
+    def __init__(self, parent=None, width=5, height=4, dpi=100, history=None):
         self.fig = Figure(figsize=(width, height), dpi=dpi)
         self.fig.patch.set_facecolor(GRAPH_BG)
         
@@ -226,13 +266,21 @@ class TemperatureGraph(FigureCanvas):
         for spine in self.axes.spines.values():
             spine.set_color(ACCENT_COLOR)
             
-        # Initialize time and temperature data
-        self.times = deque(maxlen=60)  # 5 minutes at 5-second intervals
-        self.temps = deque(maxlen=60)
+        # Temperature data (°C) lives in a fixed-memory history with rollups
+        self.history = history if history is not None else TemperatureHistory()
+        self.span = self.SPANS["1 min"]
+        self.is_celsius = True
+        self.start_time = time.time()
+        self.view_changed = True
         
-        # Set up the plot
-        self.line, = self.axes.plot([], [], color=ACCENT_COLOR, linewidth=2)
+        # Set up the plot. The line is animated: it is left out of the cached
+        # background and blitted on top of it for every new sample.
+        self.line, = self.axes.plot([], [], color=ACCENT_COLOR, linewidth=2, animated=True)
+        self.axes.set_xlim(0, 10)
         self.axes.set_ylim(0, 100)
+        self.axes.xaxis.set_major_locator(MaxNLocator(5))
+        self.axes.xaxis.set_major_formatter(FuncFormatter(self.format_time))
+        self.axes.tick_params(axis='x', labelrotation=45)
         self.axes.set_title('Temperature History', color=TEXT_COLOR)
         self.axes.set_xlabel('Time', color=TEXT_COLOR)
         self.axes.set_ylabel('Temperature (°C)', color=TEXT_COLOR)
@@ -240,44 +288,102 @@ class TemperatureGraph(FigureCanvas):
         self.fig.tight_layout()
         super().__init__(self.fig)
         
+        # Static background (axes, grid, labels), captured after every full draw
+        self.background = None
+        self.mpl_connect('draw_event', self.on_draw)
+        
+        # Frame-time counters
+        self.frame_times = deque(maxlen=100)  # ms per frame
+        self.full_redraws = 0
+        self.blits = 0
+        
+    def format_time(self, x, pos=None):
+        # x axis is seconds since start_time
+        fmt = '%H:%M:%S' if self.span <= 3600 else '%d/%m %H:%M'
+        return datetime.fromtimestamp(self.start_time + x).strftime(fmt)
+        
+    def on_draw(self, event):
+        self.background = self.copy_from_bbox(self.fig.bbox)
+        self.axes.draw_artist(self.line)
+        
     def add_data(self, temp):
-        current_time = datetime.now().strftime('%H:%M:%S')
-        self.times.append(current_time)
-        self.temps.append(temp)
+        # Record a reading (°C) and redraw
+        self.history.add(time.time(), temp)
+        self.refresh()
+        
+    def add_batch(self, batch):
+        # Record an (n, 2) array of (timestamp, °C) rows and redraw once
+        self.history.add_many(batch[:, 0], batch[:, 1])
+        self.refresh()
+        
+    def refresh(self):
+        start = time.perf_counter()
+        
+        t, low, high, mean = self.history.query(self.span, self.MAX_POINTS)
+        if len(t) == 0:
+            return
+        if not self.is_celsius:
+            low, high, mean = ((v * 9/5) + 32 for v in (low, high, mean))
+        x = t - self.start_time
         
         # Update the plot data
-        self.line.set_data(range(len(self.times)), self.temps)
+        self.line.set_data(x, mean)
         
-        # Adjust x-axis
-        if len(self.times) > 1:
-            self.axes.set_xlim(0, len(self.times) - 1)
+        # Recompute limits and layout only when the data leaves the current view
+        if self.update_view(x[-1], float(low.min()), float(high.max())) or self.background is None:
+            self.fig.tight_layout()
+            self.draw()
+            self.full_redraws += 1
+        else:
+            self.restore_region(self.background)
+            self.axes.draw_artist(self.line)
+            self.blit(self.axes.bbox)
+            self.blits += 1
+            
+        self.frame_times.append((time.perf_counter() - start) * 1000)
+        
+    def update_view(self, newest, low, high):
+        # Returns True if the axis limits had to change
+        changed = self.view_changed
+        self.view_changed = False
+        x_min, x_max = self.axes.get_xlim()
+        if changed or newest > x_max:
+            # Show the last `span` seconds with 25% headroom on the right
+            x_max = newest + self.span * 0.25
+            self.axes.set_xlim(x_max - self.span, x_max)
+            changed = True
             
         # Adjust y-axis to fit the data with some padding
-        if len(self.temps) > 0:
-            min_temp = min(self.temps) - 5
-            max_temp = max(self.temps) + 5
+        y_min, y_max = self.axes.get_ylim()
+        if changed or low < y_min or high > y_max or (y_max - y_min) > 2 * max(high - low + 10, 10):
+            min_temp = low - 5
+            max_temp = high + 5
             range_temp = max_temp - min_temp
             if range_temp < 10:  # Ensure a reasonable range
                 mean_temp = (min_temp + max_temp) / 2
                 min_temp = mean_temp - 5
                 max_temp = mean_temp + 5
             self.axes.set_ylim(min_temp, max_temp)
-            
-        # Add x-ticks at regular intervals
-        if len(self.times) > 1:
-            num_ticks = min(5, len(self.times))
-            step = max(1, len(self.times) // num_ticks)
-            tick_positions = list(range(0, len(self.times), step))
-            tick_labels = [self.times[i] for i in tick_positions]
-            self.axes.set_xticks(tick_positions)
-            self.axes.set_xticklabels(tick_labels, rotation=45)
-            
-        self.fig.tight_layout()
-        self.draw()
+            changed = True
+        return changed
+        
+    def frame_time_ms(self):
+        # Average cost of the last frames, in milliseconds
+        if not self.frame_times:
+            return 0.0
+        return sum(self.frame_times) / len(self.frame_times)
+        
+    def set_span(self, label):
+        self.span = self.SPANS[label]
+        self.view_changed = True
+        self.refresh()
         
     def set_unit(self, unit):
+        self.is_celsius = unit == "°C"
         self.axes.set_ylabel(f'Temperature ({unit})', color=TEXT_COLOR)
+        self.view_changed = True
         self.draw()
+        self.refresh()
 
 class StatusIndicator(QWidget):
     def __init__(self, parent=None):
@@ -320,120 +426,195 @@ class StatusIndicator(QWidget):
                 painter.drawEllipse(2-i, 2-i, 11+i*2, 11+i*2)
 
 class SerialManager(QObject):
-    temperature_update = pyqtSignal(float)
+    # (n, 2) float64 array of (timestamp, °C) rows: one signal per tick, not per sample
+    temperature_batch = pyqtSignal(object)
     connection_status = pyqtSignal(str, str)
+    # (lost_at, resumed_at) in epoch seconds, for every outage bridged by a reconnect
+    connection_gap = pyqtSignal(float, float)
     
-    def __init__(self):
+    def __init__(self, batch_interval=0.02):
         super().__init__()
         self.serial = None
+        self.port = None
+        self.baudrate = 9600
         self.running = False
         self.thread = None
-        self.data_buffer = []
-        
-    def connect(self, port, baudrate=9600):
+        self.stop_event = threading.Event()  # wakes the reconnect wait on disconnect()
+        self.batch_interval = batch_interval  # seconds between batch signals
+        self.batches_emitted = 0
+        self.reader = None  # TelemetryReader of the current connection: format, lost samples
+        self.calibrate = None  # raw ADC codes -> °C for boards sending binary frames
+        self.connections = 0
+        self.closed_parse_errors = 0  # from readers of earlier connections
+        
+        # Supervised connection: a failed read reopens the port with backoff
+        self.backoff = Backoff()
+        self.lost_at = None  # first failure of the current outage, until data flows again
+        self.reconnects = 0
+        self.reconnect_seconds_total = 0.0
+        self.reconnect_latencies = deque(maxlen=100)  # seconds from failure to reconnection
+        
+    def connect(self, port, baudrate=9600, calibrate=None):
         try:
+            self.calibrate = calibrate
+            self.port = port
+            self.baudrate = baudrate
             self.connection_status.emit("connecting", f"Connecting to {port}...")
-            self.serial = serial.Serial(port, baudrate, timeout=1)
+            self.serial = self.open_port()
+            self.backoff.reset()
+            self.lost_at = None
             self.running = True
-            self.thread = threading.Thread(target=self.read_loop, daemon=True)
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self.supervise, daemon=True)
             self.thread.start()
             return True
         except Exception as e:
             self.connection_status.emit("error", f"Connection error: {str(e)}")
             return False
             
-    def disconnect(self):
-        self.running = False
-        if self.thread:
-            self.thread.join(1.0)
+    def open_port(self):
+        port = serial.Serial(self.port, self.baudrate, timeout=0.2)
+        self.connections += 1
+        return port
+        
+    def close_port(self):
         if self.serial and self.serial.is_open:
             self.serial.close()
         self.serial = None
+        
+    def disconnect(self):
+        self.running = False
+        self.stop_event.set()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(1.0)
+        self.thread = None
+        self.close_port()
         self.connection_status.emit("disconnected", "Disconnected")
         
-    def read_loop(self):
+    def supervise(self):
+        # Read until the port fails, then reopen it; only disconnect() ends the session
         self.connection_status.emit("connected", "Connected")
+        while self.running:
+            error = self.read_loop()
+            if not self.running:
+                break
+            if self.lost_at is None:
+                self.lost_at = time.time()  # a reopened port that failed before any data keeps the outage open
+            self.close_port()
+            self.reconnect(error)
+            
+    def reconnect(self, error):
+        # Reopens the port; the backoff keeps growing until resumed() sees data on it
+        while self.running:
+            delay = self.backoff.next_delay()
+            self.connection_status.emit("connecting", f"Connection lost ({error}), retrying in {delay:.1f} s")
+            if self.stop_event.wait(delay):
+                return
+            try:
+                port = self.open_port()
+            except Exception as e:
+                error = str(e)
+                continue
+            if not self.running:
+                port.close()  # disconnect() won the race
+                return
+            self.serial = port
+            self.connection_status.emit("connecting", "Port reopened, waiting for data")
+            return
+            
+    def resumed(self, resumed_at):
+        # First data after an outage: only now is it a reconnect, so a flapping port
+        # adds one gap for the whole outage and its backoff is not reset on every open
+        latency = resumed_at - self.lost_at
+        self.reconnects += 1
+        self.reconnect_seconds_total += latency
+        self.reconnect_latencies.append(latency)
+        self.connection_gap.emit(self.lost_at, resumed_at)
+        self.connection_status.emit("connected", f"Reconnected after {latency:.1f} s")
+        self.lost_at = None
+        self.backoff.reset()
+        
+    def read_loop(self):
+        # Returns the error that ended the connection, None if disconnect() did
+        # ASCII lines or binary frames, whichever the board sends
+        reader = self.reader = TelemetryReader(self.serial, calibrate=self.calibrate)
+        batch = []
+        last_emit = time.time()
+        error = None
         while self.running and self.serial and self.serial.is_open:
             try:
-                if self.serial.in_waiting > 0:
-                    data = self.serial.readline().decode('utf-8').strip()
-                    try:
-                        # Try to parse temperature value
-                        temp = float(data)
-                        self.temperature_update.emit(temp)
-                        self.data_buffer.append((datetime.now(), temp))
-                    except ValueError:
-                        pass
+                # Blocks until bytes arrive or the port timeout expires, no polling sleep
+                received = reader.bytes_read
+                temps = reader.read_temperatures()
+                idle = reader.bytes_read == received  # the read timed out
+                now = time.time()
+                if len(temps):
+                    if self.lost_at is not None:
+                        self.resumed(now)
+                    batch.append(np.column_stack((np.full(len(temps), now), temps)))
+                
+                # Emit at most once per batch_interval, or right away when the line goes quiet
+                if batch and (idle or now - last_emit >= self.batch_interval):
+                    self.emit_batch(batch)
+                    batch = []
+                    last_emit = now
             except Exception as e:
-                self.connection_status.emit("error", f"Read error: {str(e)}")
+                error = str(e)
                 break
-            time.sleep(0.1)
         
-        # If we broke out of the loop due to an error but running is still True
-        if self.running:
-            self.disconnect()
+        if batch:
+            self.emit_batch(batch)
+        self.closed_parse_errors += reader.parse_errors
+        self.reader = None
+        return error
+        
+    def parse_errors(self):
+        return self.closed_parse_errors + (self.reader.parse_errors if self.reader else 0)
+        
+    def emit_batch(self, batch):
+        self.batches_emitted += 1
+        self.temperature_batch.emit(np.concatenate(batch))
 
-class DataLogger:
+class SampleCoalescer:
+    # Collects samples between two rendered frames: latest value plus min/max/mean
     def __init__(self):
-        self.data = []
-        self.last_save_time = time.time()
-        self.save_interval = 5  # seconds
-        self.filename = self.get_next_available_filename()
-        self.session_data = []  # To store all readings for this session
-        
-    def get_next_available_filename(self):
-        base_name = "temperature_log"
-        extension = ".xlsx"
-        counter = 1
-        
-        while True:
-            filename = f"{base_name}{counter}{extension}"
-            if not os.path.exists(filename):
-                return filename
-            counter += 1
-            
-    def add_data(self, temp, is_celsius):
-        timestamp = datetime.now()
-        unit = "°C" if is_celsius else "°F"
-        new_entry = {"Timestamp": timestamp, "Temperature": temp, "Unit": unit}
-        
-        # Add to both temporary buffer and session data
-        self.data.append(new_entry)
-        self.session_data.append(new_entry)
-        
-        # Check if we should save to Excel
-        current_time = time.time()
-        if current_time - self.last_save_time >= self.save_interval:
-            self.save_to_excel()
-            self.last_save_time = current_time
-            return self.filename
-        return None
-            
-    def save_to_excel(self):
-        if not self.session_data:  # Use session_data instead of data
+        self.reset()
+        
+    def reset(self):
+        self.count = 0
+        self.total = 0.0
+        self.latest = None
+        self.minimum = None
+        self.maximum = None
+        
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.latest = value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        
+    def add_many(self, values):
+        if not len(values):
+            return
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.latest = float(values[-1])
+        low, high = float(values.min()), float(values.max())
+        self.minimum = low if self.minimum is None else min(self.minimum, low)
+        self.maximum = high if self.maximum is None else max(self.maximum, high)
+        
+    def take(self, mode="latest"):
+        # Value to render for this frame, or None if nothing arrived
+        if not self.count:
             return None
-            
-        try:
-            # Create DataFrame from all session data
-            df = pd.DataFrame(self.session_data)
-            
-            # Save to current directory
-            df.to_excel(self.filename, index=False)
-            
-            # Clear only the temporary buffer
-            self.data = []
-            
-            # Return full path for display
-            full_path = os.path.abspath(self.filename)
-            return full_path
-        except Exception as e:
-            print(f"Error saving to Excel: {str(e)}")
-            return None
-            
-    def final_save(self):
-        """Save all remaining data when closing the application"""
-        if self.data:  # Save any unsaved data
-            self.save_to_excel()
+        value = self.total / self.count if mode == "mean" else self.latest
+        self.reset()
+        return value
+
+class LogSignals(QObject):
+    # Flush reports from the background log writer: path, rows written, backlog
+    log_flushed = pyqtSignal(str, int, int)
 
 class StylishCard(QFrame):
     def __init__(self, title=None, parent=None):
@@ -549,13 +730,40 @@ class TemperatureMonitorApp(QMainWindow):
         self.is_celsius = True
         self.temp_celsius = 0.0
         
+        # Bounded long-term history (°C), shared by the graph
+        self.history = TemperatureHistory()
+        
+        # Per-sensor ADC calibration, keyed by serial port
+        self.calibrations = CalibrationStore()
+        self.oversample = 4
+        
         # Serial connection manager
         self.serial_manager = SerialManager()
-        self.serial_manager.temperature_update.connect(self.update_temperature)
+        self.serial_manager.temperature_batch.connect(self.update_temperatures)
         self.serial_manager.connection_status.connect(self.update_connection_status)
+        self.serial_manager.connection_gap.connect(self.on_connection_gap)
         
-        # Data logger
+        # Data logger, written from a background thread so the GUI never waits on disk
         self.data_logger = DataLogger()
+        self.log_signals = LogSignals()
+        self.log_signals.log_flushed.connect(self.on_log_flushed)
+        self.log_writer = BackgroundLogWriter(self.data_logger,
+                                              on_flush=self.log_signals.log_flushed.emit)
+        self.log_writer.start()
+        
+        # Live feed for other tools on http://127.0.0.1:8765/stream and /metrics
+        self.publisher = SamplePublisher()
+        self.publisher.register_counter("temperature_parse_errors_total", "Lines that were not a number",
+                                        self.serial_manager.parse_errors)
+        self.publisher.register_counter("temperature_reconnects_total", "Automatic reconnects after a serial error",
+                                        lambda: self.serial_manager.reconnects)
+        self.publisher.register_counter("temperature_reconnect_seconds_total", "Time spent reconnecting",
+                                        lambda: self.serial_manager.reconnect_seconds_total)
+        try:
+            self.publisher.start()
+        except OSError as e:
+            print(f"Live feed disabled: {str(e)}")  # e.g. another monitor already has the port
+            self.publisher = None
         
         # Create central widget and layout
         self.central_widget = QWidget()
@@ -582,22 +790,53 @@ class TemperatureMonitorApp(QMainWindow):
         
         self.status_indicator = StatusIndicator()
         self.status_message = QLabel("Disconnected")
+        self.rate_label = QLabel()  # ingest vs render rate, updated once per second
         
         status_layout = QHBoxLayout()
         status_layout.addWidget(self.status_indicator)
         status_layout.addWidget(self.status_message)
+        status_layout.addWidget(self.rate_label)
         
         status_widget = QWidget()
         status_widget.setLayout(status_layout)
         self.status_bar.addPermanentWidget(status_widget)
         
-        # Initialize available ports
-        self.refresh_ports()
-        
-        # Start refresh timer for ports
-        self.port_refresh_timer = QTimer(self)
-        self.port_refresh_timer.timeout.connect(self.refresh_ports)
-        self.port_refresh_timer.start(5000)  # Refresh every 5 seconds
+        # Ports are enumerated on the watcher thread; the combo box only changes on add/remove
+        self.port_placeholders = False
+        self.port_watcher = shared_watcher()
+        self.port_watcher.ports_added.connect(self.on_ports_added)
+        self.port_watcher.ports_removed.connect(self.on_ports_removed)
+        known = self.port_watcher.ports()
+        if known:
+            self.on_ports_added(sorted(known.items()))
+        else:
+            self.show_placeholder_ports()
+        
+        # Samples are ingested at wire speed, the gauge and graph repaint at a fixed rate
+        self.render_mode = "latest"  # or "mean" of the samples since the last frame
+        self.pending = SampleCoalescer()
+        self.samples_ingested = 0
+        self.frames_rendered = 0
+        self.render_timer = QTimer(self)
+        self.render_timer.timeout.connect(self.render_frame)
+        self.set_render_fps(self.fps_spin.value())
+        
+        # Samples/s against frames/s, to confirm repaints no longer follow the serial rate
+        self.rates_seen = (0, 0)
+        self.rate_timer = QTimer(self)
+        self.rate_timer.timeout.connect(self.update_rates)
+        self.rate_timer.start(1000)
+        if self.publisher:
+            self.publisher.register_counter("temperature_samples_ingested_total", "Samples added to the history and log",
+                                            lambda: self.samples_ingested)
+            self.publisher.register_counter("temperature_frames_rendered_total", "Gauge and graph repaints",
+                                            lambda: self.frames_rendered)
+            self.publisher.register_counter("temperature_graph_frame_ms", "Average cost of the last graph frames",
+                                            self.graph.frame_time_ms, "gauge")
+            self.publisher.register_counter("temperature_graph_full_redraws_total", "Graph frames drawn in full",
+                                            lambda: self.graph.full_redraws)
+            self.publisher.register_counter("temperature_graph_blits_total", "Graph frames blitted over the background",
+                                            lambda: self.graph.blits)
         
     def create_control_section(self):
         control_card = StylishCard()
@@ -643,6 +882,18 @@ class TemperatureMonitorApp(QMainWindow):
         interval_layout.addWidget(self.interval_spin)
         control_layout.addLayout(interval_layout)
         
+        # Display refresh rate with label
+        fps_layout = QVBoxLayout()
+        fps_label = QLabel("Display FPS:")
+        fps_label.setStyleSheet(f"color: {ACCENT_COLOR}; font-weight: bold;")
+        self.fps_spin = QSpinBox()
+        self.fps_spin.setRange(1, 60)
+        self.fps_spin.setValue(10)
+        self.fps_spin.valueChanged.connect(self.set_render_fps)
+        fps_layout.addWidget(fps_label)
+        fps_layout.addWidget(self.fps_spin)
+        control_layout.addLayout(fps_layout)
+        
         # Add spacer
         control_layout.addStretch()
         
@@ -684,38 +935,57 @@ class TemperatureMonitorApp(QMainWindow):
         graph_layout = QVBoxLayout()
         graph_panel.layout.addLayout(graph_layout)
         
+        # History window selection
+        span_layout = QHBoxLayout()
+        span_label = QLabel("Show last:")
+        span_label.setStyleSheet(f"color: {ACCENT_COLOR}; font-weight: bold;")
+        self.span_combo = QComboBox()
+        self.span_combo.addItems(TemperatureGraph.SPANS.keys())
+        span_layout.addWidget(span_label)
+        span_layout.addWidget(self.span_combo)
+        span_layout.addStretch()
+        graph_layout.addLayout(span_layout)
+        
         # Create temperature graph
-        self.graph = TemperatureGraph()
+        self.graph = TemperatureGraph(history=self.history)
+        self.span_combo.currentTextChanged.connect(self.graph.set_span)
         graph_layout.addWidget(self.graph)
         
         self.splitter.addWidget(graph_panel)
         
     def refresh_ports(self):
-        current_port = self.port_combo.currentText()
-        
-        # Get available ports from system
-        available_ports = [port.device for port in serial.tools.list_ports.comports()]
+        self.port_watcher.refresh()
         
+    def show_placeholder_ports(self):
         # If no ports found, add manual options from COM1 to COM10
-        if not available_ports:
-            available_ports = ["COM1", "COM2", "COM3", "COM4", "COM5", 
-                            "COM6", "COM7", "COM8", "COM9", "COM10"]
-        
-        # Update combo box
-        self.port_combo.clear()
-        self.port_combo.addItems(available_ports)
-        
-        # Try to restore previously selected port if it exists
-        index = self.port_combo.findText(current_port)
-        if index >= 0:
-            self.port_combo.setCurrentIndex(index)
+        self.port_combo.addItems([f"COM{i}" for i in range(1, 11)])
+        self.port_placeholders = True
+        
+    def on_ports_added(self, ports):
+        if self.port_placeholders:
+            self.port_combo.clear()
+            self.port_placeholders = False
+        for device, description in ports:
+            if self.port_combo.findText(device) < 0:
+                self.port_combo.addItem(device)
+                
+    def on_ports_removed(self, devices):
+        # The selection stays put unless the selected port itself went away
+        for device in devices:
+            index = self.port_combo.findText(device)
+            if index >= 0:
+                self.port_combo.removeItem(index)
+        if self.port_combo.count() == 0:
+            self.show_placeholder_ports()
             
     def toggle_connection(self):
         if self.connect_btn.text() == "Connect":
             port = self.port_combo.currentText()
             baudrate = int(self.baud_combo.currentText())
             
-            if self.serial_manager.connect(port, baudrate):
+            # Boards sending raw ADC codes are calibrated per port, averaging `oversample` codes
+            calibrate = self.calibrations.pipeline(port, self.oversample).process
+            if self.serial_manager.connect(port, baudrate, calibrate):
                 self.connect_btn.setText("Disconnect")
                 self.connect_btn.setStyleSheet(f"""
                     background-color: {ERROR_COLOR};
@@ -746,24 +1016,58 @@ class TemperatureMonitorApp(QMainWindow):
             self.connect_btn.setText("Connect")
             self.connect_btn.setStyleSheet("")  # Reset to default style
             
-    def update_temperature(self, temp):
+    def update_temperatures(self, batch):
+        # Ingest only: every sample is logged, the display catches up in render_frame.
+        # batch is an (n, 2) array of (timestamp, °C) rows from the serial thread.
+        timestamps, temps = batch[:, 0], batch[:, 1]
+        self.samples_ingested += len(batch)
+        
         # Store temperature in Celsius
-        self.temp_celsius = temp
+        self.temp_celsius = float(temps[-1])
+        self.history.add_many(timestamps, temps)
         
         # Convert if necessary
-        display_temp = temp if self.is_celsius else (temp * 9/5) + 32
+        display_temps = temps if self.is_celsius else (temps * 9/5) + 32
+        self.pending.add_many(display_temps)
+        
+        # Log data (queued for the writer thread as one item)
+        self.log_writer.submit_batch(timestamps, display_temps, self.is_celsius)
+        if self.publisher:
+            self.publisher.publish(timestamps, temps)
+        
+    def on_connection_gap(self, lost_at, resumed_at):
+        # Same log file as before the outage, with the gap marked in it
+        self.log_writer.submit_gap(lost_at, self.is_celsius)
+        
+    def set_render_fps(self, fps):
+        self.render_timer.start(max(1, int(1000 / fps)))
+        
+    def render_frame(self):
+        display_temp = self.pending.take(self.render_mode)
+        if display_temp is None:
+            return  # Nothing new since the last frame
         unit = "°C" if self.is_celsius else "°F"
         
         # Update gauge
         self.gauge.set_temperature(display_temp, unit)
         
-        # Update graph
-        self.graph.add_data(display_temp)
-        
-        # Log data
-        log_file = self.data_logger.add_data(display_temp, self.is_celsius)
-        if log_file:
-            self.status_message.setText(f"Data saved to: {log_file}")
+        # Update graph from the history
+        self.graph.refresh()
+        self.frames_rendered += 1
+
+    def update_rates(self):
+        samples, frames = self.rates_seen
+        self.rates_seen = (self.samples_ingested, self.frames_rendered)
+        self.rate_label.setText(f"{self.samples_ingested - samples} samples/s, "
+                                f"{self.frames_rendered - frames} frames/s, "
+                                f"graph {self.graph.frame_time_ms():.1f} ms/frame")
+        self.rate_label.setToolTip(f"Graph: {self.graph.blits} blits, {self.graph.full_redraws} full redraws")
+        
+    def on_log_flushed(self, path, rows_written, backlog):
+        message = f"Data saved to: {path} ({rows_written} rows)"
+        if self.log_writer.dropped:
+            message += f" - writer behind: {self.log_writer.dropped} dropped, backlog {backlog}"
+        self.status_message.setText(message)
         
     def toggle_temperature_unit(self):
         self.is_celsius = not self.is_celsius
@@ -776,6 +1080,9 @@ class TemperatureMonitorApp(QMainWindow):
             self.unit_btn.setText("°F → °C")
             display_temp = (self.temp_celsius * 9/5) + 32
             unit = "°F"
+        
+        # Samples waiting for the next frame are in the old unit
+        self.pending.reset()
             
         # Update gauge
         self.gauge.set_temperature(display_temp, unit)
@@ -786,6 +1093,15 @@ class TemperatureMonitorApp(QMainWindow):
     def update_log_interval(self, value):
         self.data_logger.save_interval = value
 
+    def closeEvent(self, event):
+        # Stop reading, then flush the log and export the session to Excel once
+        self.serial_manager.disconnect()
+        if self.publisher:
+            self.publisher.stop()
+        self.log_writer.stop()
+        self.data_logger.final_save()
+        event.accept()
+
 def main():
     app = QApplication(sys.argv)
     window = TemperatureMonitorApp()
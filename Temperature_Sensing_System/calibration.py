@@ -0,0 +1,121 @@
+import argparse
+import json
+import os
+
+import numpy as np
+
+from telemetry import ADC_TO_CELSIUS
+
+# Host-side calibration of raw 12-bit ADC codes. Each sensor has a polynomial
+# (code -> °C) fitted from reference points; it is expanded once into a 4096-entry
+# lookup table, and oversampled (fractional) codes are interpolated between entries.
+
+ADC_CODES = 4096
+DEFAULT_COEFFICIENTS = [ADC_TO_CELSIUS, 0.0]  # the FPGA's 500*code/4096, highest power first
+
+class Calibration:
+    def __init__(self, coefficients=DEFAULT_COEFFICIENTS):
+        self.coefficients = [float(c) for c in coefficients]
+        self.table = np.polyval(self.coefficients, np.arange(ADC_CODES)).astype(np.float64)
+
+    def apply(self, codes):
+        # Integer codes index the table, fractional ones are interpolated
+        codes = np.asarray(codes)
+        if codes.dtype.kind in "ui":
+            return self.table[np.clip(codes, 0, ADC_CODES - 1)]
+        return np.interp(codes, np.arange(ADC_CODES), self.table)
+
+def fit_calibration(codes, temperatures, degree=1):
+    # Least-squares polynomial through (code, reference °C) points
+    codes = np.asarray(codes, dtype=np.float64)
+    if len(codes) <= degree:
+        raise ValueError(f"A degree {degree} fit needs at least {degree + 1} reference points")
+    return Calibration(np.polyfit(codes, np.asarray(temperatures, dtype=np.float64), degree))
+
+class Oversampler:
+    # Averages every `factor` consecutive codes; leftovers wait for the next call.
+    # Averaging N noisy samples gives up to log2(N)/2 extra bits of resolution.
+
+    def __init__(self, factor=1):
+        self.factor = factor
+        self.pending = np.zeros(0)
+
+    def process(self, codes):
+        codes = np.concatenate((self.pending, np.asarray(codes, dtype=np.float64)))
+        whole = len(codes) // self.factor * self.factor
+        self.pending = codes[whole:]
+        return codes[:whole].reshape(-1, self.factor).mean(axis=1)
+
+class CalibrationPipeline:
+    # Raw codes -> oversampled codes -> calibrated °C
+    def __init__(self, calibration=None, oversample=1):
+        self.calibration = calibration or Calibration()
+        self.oversampler = Oversampler(oversample)
+
+    def process(self, codes):
+        if self.oversampler.factor == 1:
+            return self.calibration.apply(np.asarray(codes))
+        return self.calibration.apply(self.oversampler.process(codes))
+
+class CalibrationStore:
+    # Per-sensor reference points and fitted coefficients in one JSON file. A fit is
+    # recomputed only when the sensor's points or degree change; tables are built once.
+
+    def __init__(self, path="calibration.json"):
+        self.path = path
+        self.sensors = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.sensors = json.load(f)
+        self.cache = {}  # sensor id -> Calibration
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.sensors, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def fit(self, sensor_id, codes, temperatures, degree=1):
+        points = [[int(c), float(t)] for c, t in zip(codes, temperatures)]
+        entry = self.sensors.get(sensor_id)
+        if entry and entry["points"] == points and entry["degree"] == degree:
+            return self.get(sensor_id)
+
+        calibration = fit_calibration(codes, temperatures, degree)
+        self.sensors[sensor_id] = {"points": points, "degree": degree, "coefficients": calibration.coefficients}
+        self.cache[sensor_id] = calibration
+        self.save()
+        return calibration
+
+    def get(self, sensor_id):
+        # Sensors without a fit use the FPGA's nominal scaling
+        if sensor_id not in self.cache:
+            entry = self.sensors.get(sensor_id)
+            self.cache[sensor_id] = Calibration(entry["coefficients"]) if entry else Calibration()
+        return self.cache[sensor_id]
+
+    def pipeline(self, sensor_id, oversample=1):
+        return CalibrationPipeline(self.get(sensor_id), oversample)
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit or show per-sensor ADC calibrations")
+    parser.add_argument('sensor', nargs='?', help="sensor id, e.g. the serial port it is on")
+    parser.add_argument('points', nargs='*', help="reference points as CODE:CELSIUS")
+    parser.add_argument('--degree', type=int, default=1)
+    parser.add_argument('--store', default="calibration.json")
+    args = parser.parse_args()
+
+    store = CalibrationStore(args.store)
+    if args.points:
+        codes, temps = zip(*(p.split(':') for p in args.points))
+        calibration = store.fit(args.sensor, [int(c) for c in codes], [float(t) for t in temps], args.degree)
+        residuals = calibration.apply(np.array(codes, dtype=int)) - np.array(temps, dtype=float)
+        print(f"{args.sensor}: coefficients {calibration.coefficients}, "
+              f"max residual {np.abs(residuals).max():.3f} °C")
+    else:
+        for sensor in ([args.sensor] if args.sensor else store.sensors):
+            print(f"{sensor}: {store.get(sensor).coefficients}")
+
+if __name__ == "__main__":
+    # Example usage: python calibration.py COM3 410:50.1 820:100.4 1230:150.2 --degree 2
+    main()
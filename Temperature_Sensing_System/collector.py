@@ -0,0 +1,213 @@
+import time
+START = time.perf_counter()
+
+import os
+import sys
+import signal
+import threading
+import argparse
+import subprocess
+
+import serial
+
+from data_logger import DataLogger
+from serial_reader import LineReader, Backoff, parse_temperature
+
+# Headless collector for lab servers: serial port -> log store, nothing else.
+# Only pyserial and the standard library are loaded for ASCII boards; NumPy is
+# imported only if the board turns out to send binary frames (telemetry.py), and
+# http.server only with --publish.
+
+PUBLISH_PORT = 8765  # publisher.DEFAULT_PORT, without importing http.server up front
+PROBE_BYTES = 256    # a non-ASCII byte this early in a connection means binary frames
+
+def resident_mb():
+    # Peak resident set size of this process in MB, None where it is not available
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1 << 20) if sys.platform == "darwin" else rss / 1024
+
+class Collector:
+    def __init__(self, port, baudrate=9600, backend="csv", save_interval=5, oversample=4, publisher=None):
+        self.port_name = port
+        self.baudrate = baudrate
+        self.oversample = oversample
+        self.logger = DataLogger(backend)
+        self.logger.save_interval = save_interval
+        self.serial = None
+        self.reader = None
+        self.binary = None   # TelemetryReader once binary frames are seen
+        self.probe = b""     # first PROBE_BYTES of the connection, replayed on a switch
+        self.running = False
+        self.stop_event = threading.Event()  # cuts a backoff wait short on SIGTERM
+        self.samples = 0
+        self.parse_errors = 0
+
+        # Reconnects: backoff with jitter, the outage is marked in the same log file
+        self.backoff = Backoff()
+        self.lost_at = None  # time of the last serial error, None while connected
+        self.reconnects = 0
+        self.reconnect_seconds_total = 0.0
+
+        self.publisher = publisher
+        if publisher:
+            publisher.register_counter("temperature_parse_errors_total", "Lines that were not a number",
+                                       self.total_parse_errors)
+            publisher.register_counter("temperature_reconnects_total", "Automatic reconnects after a serial error",
+                                       lambda: self.reconnects)
+            publisher.register_counter("temperature_reconnect_seconds_total", "Time spent reconnecting",
+                                       lambda: self.reconnect_seconds_total)
+
+    def open(self):
+        self.serial = serial.Serial(self.port_name, self.baudrate, timeout=0.5)
+        self.reader = LineReader(self.serial)
+        self.binary = None
+        self.probe = b""
+        if self.lost_at is None:
+            print(f"Connected to {self.port_name}, logging to {os.path.abspath(self.logger.filename)}")
+        else:
+            print(f"Reopened {self.port_name}, waiting for data")
+
+    def resumed(self):
+        # First data after an outage: only now is it a reconnect, so a flapping port
+        # marks one gap for the whole outage and its backoff is not reset on every open
+        latency = time.time() - self.lost_at
+        self.reconnects += 1
+        self.reconnect_seconds_total += latency
+        self.logger.mark_gap(self.lost_at, True)
+        self.lost_at = None
+        print(f"Reconnected after {latency:.1f} s, gap marked in {self.logger.filename}")
+
+    def read(self):
+        # Returns the temperatures (°C) of one blocking read
+        if self.binary:
+            return list(self.binary.read_temperatures())
+        data = self.serial.read(max(1, self.serial.in_waiting))
+        if not data:
+            return []
+        # Keep probing for a while: a read may start mid-frame on a payload byte below 0x80
+        if len(self.probe) < PROBE_BYTES:
+            self.probe += data
+            if any(b >= 0x80 for b in data):
+                return self.switch_to_binary(self.probe)
+        values = [parse_temperature(line) for line in self.reader.split_lines(data)]
+        temps = [t for t in values if t is not None]
+        self.parse_errors += len(values) - len(temps)
+        return temps
+
+    def total_parse_errors(self):
+        return self.parse_errors + (self.binary.parse_errors if self.binary else 0)
+
+    def switch_to_binary(self, data):
+        from telemetry import TelemetryReader
+        from calibration import CalibrationStore
+        calibrate = CalibrationStore().pipeline(self.port_name, self.oversample).process
+        self.binary = TelemetryReader(self.serial, calibrate=calibrate)
+        print(f"{self.port_name}: non-ASCII data, reading with the binary-capable TelemetryReader")
+        return list(self.binary.decode(self.binary.detect(data)))
+
+    def run(self):
+        self.running = True
+        while self.running:
+            try:
+                if self.serial is None:
+                    self.open()
+                temps = self.read()
+            except (serial.SerialException, OSError) as e:
+                if self.lost_at is None and self.samples:
+                    self.lost_at = time.time()
+                delay = self.backoff.next_delay()
+                print(f"Serial error: {e}, retrying in {delay:.1f} s")
+                self.close_port()
+                self.stop_event.wait(delay)
+                continue
+
+            if temps:
+                if self.lost_at is not None:
+                    self.resumed()
+                self.backoff.reset()
+                now = time.time()
+                self.logger.append_many([now] * len(temps), temps, True)
+                self.samples += len(temps)
+                if self.publisher:
+                    self.publisher.publish([now] * len(temps), temps)
+            if time.time() - self.logger.last_save_time >= self.logger.save_interval:
+                if self.logger.flush():
+                    print(f"{self.logger.rows_written} rows written")
+                self.logger.last_save_time = time.time()
+        self.close()
+
+    def stop(self, *args):
+        self.running = False
+        self.stop_event.set()
+
+    def close_port(self):
+        if self.binary:
+            self.parse_errors += self.binary.parse_errors
+            self.binary = None
+        if self.serial is not None:
+            self.serial.close()
+        self.serial = None
+
+    def close(self):
+        # No Excel export here, that would import pandas
+        self.close_port()
+        if self.publisher:
+            self.publisher.stop()
+        self.logger.flush()
+        self.logger.close()
+        print(f"Stopped after {self.samples} samples, {self.logger.rows_written} rows in {self.logger.filename}")
+
+def measure_imports(modules=("collector", "Final_GUI")):
+    # Startup time and peak RSS of a fresh interpreter importing each entry point
+    here = os.path.dirname(os.path.abspath(__file__))
+    code = ("import time; t = time.perf_counter(); import {0}; "
+            "from collector import resident_mb; print(time.perf_counter() - t, resident_mb())")
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    for module in modules:
+        out = subprocess.run([sys.executable, "-c", code.format(module)], cwd=here, env=env,
+                             capture_output=True, text=True)
+        if out.returncode:
+            print(f"{module:10s} failed to import: {out.stderr.strip().splitlines()[-1]}")
+            continue
+        seconds, rss = out.stdout.split()
+        print(f"{module:10s} import {float(seconds) * 1000:7.1f} ms, peak RSS {float(rss):6.1f} MB")
+
+def main():
+    parser = argparse.ArgumentParser(description="Log temperatures from the FPGA without a GUI")
+    parser.add_argument('port', nargs='?', help="serial port, e.g. /dev/ttyUSB0 or COM3")
+    parser.add_argument('--baud', type=int, default=9600)
+    parser.add_argument('--backend', choices=["csv", "sqlite"], default="csv")
+    parser.add_argument('--interval', type=float, default=5, help="seconds between log flushes")
+    parser.add_argument('--oversample', type=int, default=4, help="ADC codes averaged for binary boards")
+    parser.add_argument('--publish', type=int, nargs='?', const=PUBLISH_PORT, default=None, metavar='PORT',
+                        help=f"serve /stream and /metrics on localhost (default port {PUBLISH_PORT})")
+    parser.add_argument('--measure', action='store_true', help="compare startup cost with the GUI and exit")
+    args = parser.parse_args()
+
+    if args.measure:
+        measure_imports()
+        return
+    if not args.port:
+        parser.error("a serial port is required")
+
+    publisher = None
+    if args.publish is not None:
+        from publisher import SamplePublisher
+        publisher = SamplePublisher(port=args.publish)
+        publisher.start()
+        print(f"Publishing on http://127.0.0.1:{publisher.port}/stream and /metrics")
+    collector = Collector(args.port, args.baud, args.backend, args.interval, args.oversample, publisher)
+    signal.signal(signal.SIGINT, collector.stop)
+    signal.signal(signal.SIGTERM, collector.stop)
+    rss = resident_mb()
+    print(f"Started in {(time.perf_counter() - START) * 1000:.0f} ms"
+          + (f", RSS {rss:.1f} MB" if rss is not None else ""))
+    collector.run()
+
+if __name__ == "__main__":
+    # Example usage: python collector.py /dev/ttyUSB0 --backend sqlite
+    main()
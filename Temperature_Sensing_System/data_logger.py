@@ -0,0 +1,270 @@
+import os
+import csv
+import time
+import queue
+import sqlite3
+import threading
+from datetime import datetime
+
+COLUMNS = ["Timestamp", "Temperature", "Unit"]
+
+class CSVLogStore:
+    # Append-only CSV file, every flush writes only the new rows
+    extension = ".csv"
+
+    def __init__(self, filename):
+        self.filename = filename
+        is_new = not os.path.exists(filename) or os.path.getsize(filename) == 0
+        self.file = open(filename, "a", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        if is_new:
+            self.writer.writerow(COLUMNS)
+            self.file.flush()
+
+    def append(self, rows):
+        self.writer.writerows(
+            (row["Timestamp"].isoformat(sep=" "), row["Temperature"], row["Unit"]) for row in rows
+        )
+        self.file.flush()
+
+    def read_all(self):
+        self.file.flush()
+        with open(self.filename, newline="", encoding="utf-8") as f:
+            return [
+                {"Timestamp": datetime.fromisoformat(r["Timestamp"]),
+                 "Temperature": float(r["Temperature"]),
+                 "Unit": r["Unit"]}
+                for r in csv.DictReader(f)
+            ]
+
+    def close(self):
+        self.file.close()
+
+class SQLiteLogStore:
+    # Append-only SQLite table, each flush is one transaction
+    extension = ".sqlite"
+
+    def __init__(self, filename):
+        self.filename = filename
+        # The store may be created on one thread and written from another
+        self.db = sqlite3.connect(filename, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS samples (timestamp TEXT, temperature REAL, unit TEXT)"
+        )
+        self.db.commit()
+
+    def append(self, rows):
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO samples VALUES (?, ?, ?)",
+                ((row["Timestamp"].isoformat(sep=" "), row["Temperature"], row["Unit"]) for row in rows),
+            )
+
+    def read_all(self):
+        return [
+            {"Timestamp": datetime.fromisoformat(ts), "Temperature": temp, "Unit": unit}
+            for ts, temp, unit in self.db.execute("SELECT timestamp, temperature, unit FROM samples")
+        ]
+
+    def close(self):
+        self.db.close()
+
+LOG_STORES = {"csv": CSVLogStore, "sqlite": SQLiteLogStore}
+
+class DataLogger:
+    def __init__(self, backend="csv"):
+        self.data = []  # Readings not flushed to the log store yet
+        self.last_save_time = time.time()
+        self.save_interval = 5  # seconds
+        self.store_class = LOG_STORES[backend]
+        self.filename = self.get_next_available_filename()
+        self.store = None  # opened by the first flush with rows, so an idle session leaves no file
+        self.rows_written = 0
+
+    def get_next_available_filename(self):
+        base_name = "temperature_log"
+        extension = self.store_class.extension
+        counter = 1
+
+        while True:
+            filename = f"{base_name}{counter}{extension}"
+            # Keep the number free for the Excel export as well
+            if not os.path.exists(filename) and not os.path.exists(f"{base_name}{counter}.xlsx"):
+                return filename
+            counter += 1
+
+    def append(self, temp, is_celsius, timestamp=None):
+        # Buffer one reading until the next flush
+        timestamp = timestamp or datetime.now()
+        unit = "°C" if is_celsius else "°F"
+        self.data.append({"Timestamp": timestamp, "Temperature": temp, "Unit": unit})
+
+    def append_many(self, timestamps, temps, is_celsius):
+        # Buffer a batch of readings; timestamps are epoch seconds
+        unit = "°C" if is_celsius else "°F"
+        self.data.extend(
+            {"Timestamp": datetime.fromtimestamp(t), "Temperature": float(temp), "Unit": unit}
+            for t, temp in zip(timestamps, temps)
+        )
+
+    def mark_gap(self, start, is_celsius):
+        # A NaN reading at `start` (epoch seconds) marks an outage; the next row is when data resumed
+        self.append_many([start], [float("nan")], is_celsius)
+
+    def add_data(self, temp, is_celsius, timestamp=None):
+        self.append(temp, is_celsius, timestamp)
+
+        # Check if we should flush to the log store
+        current_time = time.time()
+        if current_time - self.last_save_time >= self.save_interval:
+            self.flush()
+            self.last_save_time = current_time
+            return self.filename
+        return None
+
+    def flush(self):
+        # Append only the rows added since the last flush: O(new rows), not O(session)
+        if not self.data:
+            return None
+
+        try:
+            if self.store is None:
+                self.store = self.store_class(self.filename)
+            self.store.append(self.data)
+            self.rows_written += len(self.data)
+            self.data = []
+            return os.path.abspath(self.filename)
+        except Exception as e:
+            print(f"Error writing log: {str(e)}")
+            return None
+
+    def save_to_excel(self):
+        # One-off export of the whole session log, on demand or at shutdown
+        self.flush()
+        if self.store is None:
+            return None  # nothing was logged
+        rows = self.store.read_all()
+        if not rows:
+            return None
+
+        try:
+            import pandas as pd  # Only needed for the export
+
+            excel_name = os.path.splitext(self.filename)[0] + ".xlsx"
+            pd.DataFrame(rows, columns=COLUMNS).to_excel(excel_name, index=False)
+            return os.path.abspath(excel_name)
+        except Exception as e:
+            print(f"Error saving to Excel: {str(e)}")
+            return None
+
+    def final_save(self):
+        """Flush remaining data and export the session to Excel when closing the application"""
+        path = self.save_to_excel()
+        self.close()
+        return path
+
+    def close(self):
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
+class BackgroundLogWriter:
+    # Runs DataLogger on its own thread. Batches of samples arrive through a bounded
+    # queue, are flushed every save_interval, and on_flush(path, rows_written, backlog)
+    # is called from the writer thread after each flush.
+
+    def __init__(self, logger, max_queue=10000, on_flush=None):
+        self.logger = logger
+        self.on_flush = on_flush
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.running = False
+        self.thread = None
+
+        # Back-pressure counters
+        self.submitted = 0
+        self.dropped = 0        # samples refused because the queue was full
+        self.max_backlog = 0    # highest queue depth seen, in batches
+        self.flushes = 0
+        self.last_flush_ms = 0.0
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, temp, is_celsius):
+        return self.submit_batch([time.time()], [temp], is_celsius)
+
+    def submit_batch(self, timestamps, temps, is_celsius):
+        # Never blocks the caller; a full queue means the writer has fallen behind
+        try:
+            self.queue.put_nowait((timestamps, temps, is_celsius))
+        except queue.Full:
+            self.dropped += len(temps)
+            return False
+        self.submitted += len(temps)
+        self.max_backlog = max(self.max_backlog, self.queue.qsize())
+        return True
+
+    def submit_gap(self, start, is_celsius):
+        return self.submit_batch([start], [float("nan")], is_celsius)
+
+    def backlog(self):
+        return self.queue.qsize()
+
+    def run(self):
+        while self.running or not self.queue.empty():
+            try:
+                item = self.queue.get(timeout=0.2)
+            except queue.Empty:
+                self.flush_if_due()
+                continue
+            if item is None:
+                continue
+
+            # Drain whatever else is waiting in one go
+            batch = [item]
+            while True:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    batch.append(item)
+            for timestamps, temps, is_celsius in batch:
+                self.logger.append_many(timestamps, temps, is_celsius)
+            self.flush_if_due()
+
+    def flush_if_due(self):
+        if time.time() - self.logger.last_save_time >= self.logger.save_interval:
+            self.flush()
+
+    def flush(self):
+        start = time.perf_counter()
+        path = self.logger.flush()
+        self.logger.last_save_time = time.time()
+        if path is None:
+            return
+        self.last_flush_ms = (time.perf_counter() - start) * 1000
+        self.flushes += 1
+        if self.on_flush:
+            self.on_flush(path, self.logger.rows_written, self.backlog())
+
+    def stop(self):
+        # Drain the queue and flush what is left; the logger is then safe to use again
+        self.running = False
+        if self.thread:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+        self.flush()
+
+    def stats(self):
+        return {
+            "submitted": self.submitted,
+            "dropped": self.dropped,
+            "backlog": self.backlog(),
+            "max_backlog": self.max_backlog,
+            "flushes": self.flushes,
+            "last_flush_ms": self.last_flush_ms,
+        }
@@ -0,0 +1,147 @@
+import numpy as np
+
+# Fixed-memory temperature history: a raw ring buffer plus min/max/mean rollups
+# at coarser resolutions, so any time span can be drawn from a bounded number of points.
+
+# (resolution in seconds, capacity); resolution 0 is the raw sample ring
+LEVELS = [
+    (0, 3600),      # raw samples
+    (1, 3600),      # 1 s buckets, one hour
+    (60, 10080),    # 1 min buckets, one week
+    (3600, 8760),   # 1 h buckets, one year
+]
+
+class RingBuffer:
+    # Parallel NumPy columns with a fixed capacity; the oldest rows are overwritten
+
+    def __init__(self, capacity, dtypes):
+        self.capacity = capacity
+        self.columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in dtypes.items()}
+        self.head = 0  # next row to write
+        self.size = 0
+
+    def extend(self, **values):
+        n = len(next(iter(values.values())))
+        if n == 0:
+            return
+        skip = max(0, n - self.capacity)  # only the newest `capacity` rows survive
+        idx = (self.head + np.arange(skip, n)) % self.capacity
+        for name, column in values.items():
+            self.columns[name][idx] = column[skip:]
+        self.head = (self.head + n) % self.capacity
+        self.size = min(self.capacity, self.size + n)
+
+    def ordered(self, name):
+        # Column in chronological order (a copy)
+        idx = (self.head - self.size + np.arange(self.size)) % self.capacity
+        return self.columns[name][idx]
+
+    def __len__(self):
+        return self.size
+
+    def nbytes(self):
+        return sum(c.nbytes for c in self.columns.values())
+
+class RollupLevel:
+    # Buckets of `resolution` seconds; the newest bucket stays open until a later one starts
+
+    def __init__(self, resolution, capacity):
+        self.resolution = resolution
+        self.ring = RingBuffer(capacity, {
+            "t": np.float64, "min": np.float32, "max": np.float32, "mean": np.float32, "count": np.int32,
+        })
+        self.bucket = None  # open bucket index
+        self.acc = None     # [min, max, sum, count] of the open bucket
+
+    def add_many(self, t, v):
+        buckets = np.floor(t / self.resolution)
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+        mins = np.minimum.reduceat(v, starts)
+        maxs = np.maximum.reduceat(v, starts)
+        sums = np.add.reduceat(v.astype(np.float64), starts)
+        counts = np.diff(np.append(starts, len(v)))
+        groups = buckets[starts]
+
+        # The first group may continue the open bucket
+        if self.bucket is not None:
+            if groups[0] == self.bucket:
+                mins[0] = min(mins[0], self.acc[0])
+                maxs[0] = max(maxs[0], self.acc[1])
+                sums[0] += self.acc[2]
+                counts[0] += self.acc[3]
+            else:
+                self.commit(np.array([self.bucket]), *([x] for x in self.acc))
+
+        # Every group but the last is complete; the last one becomes the open bucket
+        self.commit(groups[:-1], mins[:-1], maxs[:-1], sums[:-1], counts[:-1])
+        self.bucket = groups[-1]
+        self.acc = [mins[-1], maxs[-1], sums[-1], counts[-1]]
+
+    def commit(self, groups, mins, maxs, sums, counts):
+        counts = np.asarray(counts)
+        self.ring.extend(
+            t=np.asarray(groups) * self.resolution,
+            min=np.asarray(mins), max=np.asarray(maxs),
+            mean=np.asarray(sums) / counts, count=counts,
+        )
+
+    def query(self):
+        # (t, min, max, mean) including the open bucket
+        t, lo, hi, mean = (self.ring.ordered(c) for c in ("t", "min", "max", "mean"))
+        if self.bucket is not None:
+            mn, mx, total, count = self.acc
+            t = np.append(t, self.bucket * self.resolution)
+            lo = np.append(lo, np.float32(mn))
+            hi = np.append(hi, np.float32(mx))
+            mean = np.append(mean, np.float32(total / count))
+        return t, lo, hi, mean
+
+class TemperatureHistory:
+    def __init__(self, levels=LEVELS):
+        raw_capacity = levels[0][1]
+        self.raw = RingBuffer(raw_capacity, {"t": np.float64, "value": np.float32})
+        self.levels = [RollupLevel(res, cap) for res, cap in levels[1:]]
+
+    def add(self, timestamp, value):
+        self.add_many(np.array([timestamp], dtype=np.float64), np.array([value], dtype=np.float32))
+
+    def add_many(self, timestamps, values):
+        # Batches of samples in time order, e.g. one serial read
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float32)
+        if len(timestamps) == 0:
+            return
+        self.raw.extend(t=timestamps, value=values)
+        for level in self.levels:
+            level.add_many(timestamps, values)
+
+    def latest(self):
+        if not len(self.raw):
+            return None
+        idx = (self.raw.head - 1) % self.raw.capacity
+        return self.raw.columns["t"][idx], self.raw.columns["value"][idx]
+
+    def query(self, span, max_points=600, now=None):
+        # (t, min, max, mean) covering the last `span` seconds with at most about
+        # `max_points` points, taken from the finest resolution that fits
+        if not len(self.raw):
+            empty = np.zeros(0)
+            return empty, empty, empty, empty
+        now = self.latest()[0] if now is None else now
+        start = now - span
+
+        # The window is (start, now]: span * rate samples, not one more
+        t = self.raw.ordered("t")
+        first = np.searchsorted(t, start, side='right')
+        if len(t) - first <= max_points and (first > 0 or len(t) < self.raw.capacity):
+            value = self.raw.ordered("value")[first:]
+            return t[first:], value, value, value
+
+        for level in self.levels:
+            if span / level.resolution <= max_points or level is self.levels[-1]:
+                t, lo, hi, mean = level.query()
+                first = np.searchsorted(t, start, side='right')
+                return t[first:], lo[first:], hi[first:], mean[first:]
+
+    def nbytes(self):
+        return self.raw.nbytes() + sum(level.ring.nbytes() for level in self.levels)
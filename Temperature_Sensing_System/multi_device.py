@@ -0,0 +1,185 @@
+import os
+import sys
+import time
+import threading
+import selectors
+
+import numpy as np
+
+from history import TemperatureHistory
+from telemetry import TelemetryReader
+
+# Several boards at once: a small pool of reader threads multiplexes N serial ports
+# (select() on POSIX, one thread per port elsewhere) into one store indexed by device.
+# Readers never signal the GUI; the dashboard pulls whatever changed once per frame.
+# Each worker hands its samples to the store once per batch_interval, not once per read.
+
+class DeviceStore:
+    def __init__(self, devices):
+        self.lock = threading.Lock()
+        self.histories = {device: TemperatureHistory() for device in devices}
+        self.latest = {device: None for device in devices}
+        self.samples = {device: 0 for device in devices}
+        self.changed = set()
+
+    def add(self, device, timestamps, temps):
+        with self.lock:
+            self.histories[device].add_many(timestamps, temps)
+            self.latest[device] = float(temps[-1])
+            self.samples[device] += len(temps)
+            self.changed.add(device)
+
+    def take_changed(self):
+        # {device: latest °C} for the devices that received samples since the last call
+        with self.lock:
+            changed, self.changed = self.changed, set()
+            return {device: self.latest[device] for device in changed}
+
+    def query(self, device, span, max_points=600):
+        with self.lock:
+            return self.histories[device].query(span, max_points)
+
+    def devices(self):
+        return list(self.histories)
+
+class ReaderPool:
+    # ports: {device name: opened serial.Serial}. With select() available, `workers`
+    # threads share the ports; otherwise every port gets its own blocking reader.
+    # calibrations: {device name: codes -> °C} for boards sending binary frames.
+
+    def __init__(self, store, ports, workers=2, calibrations=None, batch_interval=0.05):
+        self.store = store
+        self.ports = ports
+        self.batch_interval = batch_interval
+        calibrations = calibrations or {}
+        self.readers = {device: TelemetryReader(port, calibrate=calibrations.get(device))
+                        for device, port in ports.items()}
+        self.use_select = os.name == "posix"
+        self.workers = min(workers, len(ports)) if self.use_select else len(ports)
+        self.errors = {}         # device -> last read error
+        self.worker_cpu = {}     # worker index -> CPU seconds used, filled in when it stops
+        self.running = False
+        self.threads = []
+
+    def start(self):
+        self.running = True
+        devices = list(self.ports)
+        for i in range(self.workers):
+            share = devices[i::self.workers]
+            target = self.select_loop if self.use_select else self.blocking_loop
+            thread = threading.Thread(target=target, args=(i, share), daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self):
+        self.running = False
+        for thread in self.threads:
+            thread.join(1.0)
+        self.threads = []
+
+    def read(self, device, pending):
+        # Appends (timestamps, temps) to pending[device]; False once the port fails
+        try:
+            temps = self.readers[device].read_temperatures()
+        except Exception as e:
+            self.errors[device] = str(e)
+            return False
+        if len(temps):
+            pending.setdefault(device, []).append((np.full(len(temps), time.time()), temps))
+        return True
+
+    def flush(self, pending):
+        for device, chunks in pending.items():
+            timestamps, temps = zip(*chunks)
+            self.store.add(device, np.concatenate(timestamps), np.concatenate(temps))
+        pending.clear()
+
+    def select_loop(self, index, devices):
+        selector = selectors.DefaultSelector()
+        for device in devices:
+            self.ports[device].timeout = 0  # only read what select() reported
+            selector.register(self.ports[device].fileno(), selectors.EVENT_READ, device)
+        pending = {}
+        last_flush = time.time()
+        while self.running and selector.get_map():
+            for key, _ in selector.select(timeout=self.batch_interval):
+                if not self.read(key.data, pending):
+                    selector.unregister(key.fd)
+            if time.time() - last_flush >= self.batch_interval:
+                self.flush(pending)
+                last_flush = time.time()
+        self.flush(pending)
+        selector.close()
+        self.worker_cpu[index] = time.thread_time()
+
+    def blocking_loop(self, index, devices):
+        (device,) = devices
+        pending = {}
+        last_flush = time.time()
+        while self.running and self.read(device, pending):
+            if time.time() - last_flush >= self.batch_interval:
+                self.flush(pending)
+                last_flush = time.time()
+        self.flush(pending)
+        self.worker_cpu[index] = time.thread_time()
+
+    def cpu_time(self):
+        return sum(self.worker_cpu.values())
+
+def open_ports(names, baudrate=9600):
+    import serial
+    return {name: serial.Serial(name, baudrate, timeout=0.2) for name in names}
+
+def benchmark(counts=(1, 2, 4, 8, 16), lines_per_second=100, duration=2.0):
+    # Reader CPU for N fake boards on ptys, pooled select() vs one thread per board
+    import pty
+    import serial
+
+    for workers_label, pooled in (("pool of 2", True), ("thread/port", False)):
+        for n in counts:
+            pairs = [pty.openpty() for _ in range(n)]
+            ports = {f"board{i}": serial.Serial(os.ttyname(slave), 9600, timeout=0.2)
+                     for i, (master, slave) in enumerate(pairs)}
+            store = DeviceStore(ports)
+            pool = ReaderPool(store, ports, workers=2)
+            if not pooled:
+                pool.use_select = False
+                pool.workers = n
+            running = True
+
+            def device():
+                # All boards tick together, like boards sharing a sample clock
+                interval = 1.0 / lines_per_second
+                next_time = time.perf_counter()
+                i = 0
+                while running:
+                    for master, _ in pairs:
+                        os.write(master, b"%03d\r\n" % (i % 100))
+                    i += 1
+                    next_time += interval
+                    time.sleep(max(0.0, next_time - time.perf_counter()))
+
+            writer = threading.Thread(target=device, daemon=True)
+            writer.start()
+            pool.start()
+            time.sleep(duration)
+            running = False
+            writer.join()
+            pool.stop()
+            for port in ports.values():
+                port.close()
+            for master, slave in pairs:
+                os.close(master)
+                os.close(slave)
+
+            received = sum(store.samples.values())
+            cpu = pool.cpu_time() / duration * 100
+            print(f"{workers_label:12s} {n:3d} boards: {received / duration:8.0f} samples/s, "
+                  f"reader CPU {cpu:5.1f}% ({cpu / n:4.2f}% per board)")
+
+if __name__ == "__main__":
+    # Example usage: python multi_device.py [lines per second per board]
+    if not sys.platform.startswith(("linux", "darwin")):
+        raise SystemExit("The pty benchmark needs Linux or macOS")
+    args = [float(a) for a in sys.argv[1:2]]
+    benchmark((1, 2, 4, 8, 16), *args)
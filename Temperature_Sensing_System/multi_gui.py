@@ -0,0 +1,201 @@
+import sys
+import time
+import math
+import argparse
+
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+                             QGridLayout, QLabel, QComboBox, QSplitter)
+from PyQt5.QtCore import Qt, QTimer
+
+from Final_GUI import (TemperatureGauge, TemperatureGraph, StylishCard, DARK_BG, DARK_CARD_BG,
+                       TEXT_COLOR, ACCENT_COLOR, SUCCESS_COLOR, WARNING_COLOR, ERROR_COLOR,
+                       GRAPH_BG, COLD_COLOR, WARM_COLOR, HOT_COLOR)
+from multi_device import DeviceStore, ReaderPool, open_ports
+from calibration import CalibrationStore
+
+# Dashboard for several boards: one gauge per board and one plot with a line per board,
+# all repainted from the shared DeviceStore by a single render timer.
+
+LINE_COLORS = [ACCENT_COLOR, SUCCESS_COLOR, WARNING_COLOR, ERROR_COLOR, COLD_COLOR, WARM_COLOR, HOT_COLOR]
+
+class CompactGauge(TemperatureGauge):
+    # No needle animation: a board's gauge repaints once per rendered frame at most
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumSize(140, 180)
+
+    def set_temperature(self, temp, unit="°C"):
+        self.temperature = self.display_temp = temp
+        self.unit = unit
+        self.update()
+
+class CombinedGraph(TemperatureGraph):
+    # One animated line per device, blitted over the cached background together
+    def __init__(self, store, parent=None, width=5, height=4, dpi=100):
+        self.store = store
+        super().__init__(parent, width, height, dpi)
+        self.line.remove()
+        self.lines = {}
+        for i, device in enumerate(store.devices()):
+            color = LINE_COLORS[i % len(LINE_COLORS)]
+            self.lines[device], = self.axes.plot([], [], color=color, linewidth=1.5, animated=True, label=device)
+        self.axes.legend(loc='upper left', facecolor=GRAPH_BG, labelcolor=TEXT_COLOR, fontsize='small')
+        self.axes.set_title('All Boards', color=TEXT_COLOR)
+
+    def on_draw(self, event):
+        self.background = self.copy_from_bbox(self.fig.bbox)
+        for line in self.lines.values():
+            self.axes.draw_artist(line)
+
+    def refresh(self):
+        start = time.perf_counter()
+
+        newest, low, high = None, math.inf, -math.inf
+        for device, line in self.lines.items():
+            t, lo, hi, mean = self.store.query(device, self.span, self.MAX_POINTS)
+            if len(t) == 0:
+                continue
+            if not self.is_celsius:
+                lo, hi, mean = ((v * 9/5) + 32 for v in (lo, hi, mean))
+            x = t - self.start_time
+            line.set_data(x, mean)
+            newest = x[-1] if newest is None else max(newest, x[-1])
+            low, high = min(low, float(lo.min())), max(high, float(hi.max()))
+        if newest is None:
+            return
+
+        if self.update_view(newest, low, high) or self.background is None:
+            self.fig.tight_layout()
+            self.draw()
+            self.full_redraws += 1
+        else:
+            self.restore_region(self.background)
+            for line in self.lines.values():
+                self.axes.draw_artist(line)
+            self.blit(self.axes.bbox)
+            self.blits += 1
+
+        self.frame_times.append((time.perf_counter() - start) * 1000)
+
+class MultiDeviceWindow(QMainWindow):
+    def __init__(self, ports, workers=2, fps=10, calibrations=None):
+        super().__init__()
+        self.setWindowTitle("Multi-Board Temperature Monitor")
+        self.resize(1100, 750)
+        self.setStyleSheet(f"""
+            QMainWindow, QWidget {{
+                background-color: {DARK_BG};
+                color: {TEXT_COLOR};
+                font-family: 'Segoe UI', Arial, sans-serif;
+            }}
+            QComboBox {{
+                background-color: {DARK_CARD_BG};
+                color: {TEXT_COLOR};
+                border: 2px solid {ACCENT_COLOR};
+                border-radius: 6px;
+                padding: 4px;
+            }}
+        """)
+
+        # Readers fill the store; nothing crosses threads per sample
+        self.ports = ports
+        self.store = DeviceStore(ports)
+        self.pool = ReaderPool(self.store, ports, workers, calibrations)
+
+        central = QWidget()
+        layout = QVBoxLayout(central)
+        self.setCentralWidget(central)
+
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Show last:"))
+        self.span_combo = QComboBox()
+        self.span_combo.addItems(list(TemperatureGraph.SPANS))
+        controls.addWidget(self.span_combo)
+        controls.addStretch()
+        layout.addLayout(controls)
+
+        splitter = QSplitter(Qt.Vertical)
+        layout.addWidget(splitter)
+
+        # Grid of gauges, as square as the board count allows
+        gauge_card = StylishCard("Boards")
+        grid = QGridLayout()
+        gauge_card.layout.addLayout(grid)
+        columns = math.ceil(math.sqrt(len(ports)))
+        self.gauges = {}
+        self.labels = {}
+        for i, device in enumerate(ports):
+            cell = QVBoxLayout()
+            self.labels[device] = QLabel(device)
+            self.labels[device].setAlignment(Qt.AlignCenter)
+            self.gauges[device] = CompactGauge()
+            cell.addWidget(self.labels[device])
+            cell.addWidget(self.gauges[device])
+            grid.addLayout(cell, i // columns, i % columns)
+        splitter.addWidget(gauge_card)
+
+        graph_card = StylishCard("Combined History")
+        self.graph = CombinedGraph(self.store, width=8, height=3)
+        graph_card.layout.addWidget(self.graph)
+        splitter.addWidget(graph_card)
+        self.span_combo.currentTextChanged.connect(self.graph.set_span)
+
+        self.status_message = QLabel()
+        self.statusBar().addPermanentWidget(self.status_message)
+        self.samples_seen = 0
+
+        self.render_timer = QTimer(self)
+        self.render_timer.timeout.connect(self.render_frame)
+        self.render_timer.start(max(1, int(1000 / fps)))
+        self.status_timer = QTimer(self)
+        self.status_timer.timeout.connect(self.update_status)
+        self.status_timer.start(1000)
+
+        self.pool.start()
+
+    def render_frame(self):
+        changed = self.store.take_changed()
+        for device, temp in changed.items():
+            self.gauges[device].set_temperature(temp)
+        if changed:
+            self.graph.refresh()
+
+    def update_status(self):
+        total = sum(self.store.samples.values())
+        rate, self.samples_seen = total - self.samples_seen, total
+        for device, error in self.pool.errors.items():
+            self.labels[device].setText(f"{device} (error)")
+            self.labels[device].setToolTip(error)
+        self.status_message.setText(f"{len(self.ports)} boards, {rate} samples/s, "
+                                    f"{len(self.pool.errors)} with errors")
+
+    def closeEvent(self, event):
+        self.render_timer.stop()
+        self.pool.stop()
+        for port in self.ports.values():
+            port.close()
+        event.accept()
+
+def main():
+    parser = argparse.ArgumentParser(description="Monitor several temperature boards at once")
+    parser.add_argument('ports', nargs='+', help="serial ports, e.g. COM3 COM4 or /dev/ttyUSB0 /dev/ttyUSB1")
+    parser.add_argument('--baud', type=int, default=9600)
+    parser.add_argument('--workers', type=int, default=2, help="reader threads shared by all ports")
+    parser.add_argument('--fps', type=int, default=10)
+    parser.add_argument('--oversample', type=int, default=4, help="ADC codes averaged for binary boards")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    try:
+        ports = open_ports(args.ports, args.baud)
+    except Exception as e:
+        sys.exit(f"Could not open the ports: {e}")
+    calibrations = CalibrationStore()
+    window = MultiDeviceWindow(ports, args.workers, args.fps,
+                               {name: calibrations.pipeline(name, args.oversample).process for name in ports})
+    window.show()
+    sys.exit(app.exec_())
+
+if __name__ == "__main__":
+    # Example usage: python multi_gui.py /dev/ttyUSB0 /dev/ttyUSB1 /dev/ttyUSB2
+    main()
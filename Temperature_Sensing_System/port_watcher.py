@@ -0,0 +1,111 @@
+import os
+import sys
+import time
+import threading
+
+import serial.tools.list_ports
+from PyQt5.QtCore import QObject, pyqtSignal
+
+# Serial port enumeration off the GUI thread. The watcher scans every `interval` seconds
+# on its own thread and emits only what changed, so an idle port list costs the UI nothing.
+# On Linux it first lists /dev and calls comports() (which walks sysfs) only when the
+# tty entries there have changed.
+
+class PortWatcher(QObject):
+    ports_added = pyqtSignal(list)    # [(device, description)]
+    ports_removed = pyqtSignal(list)  # [device]
+    refreshed = pyqtSignal(int)       # port count, after a scan requested with refresh()
+
+    def __init__(self, interval=3.0):
+        super().__init__()
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.known = {}                # device -> description
+        self.dev_entries = None        # last tty listing of /dev (Linux)
+        self.wake = threading.Event()
+        self.forced = False
+        self.running = False
+        self.thread = None
+        self.scans = 0                 # comports() calls, for measuring
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.wake.set()
+        if self.thread:
+            self.thread.join(1.0)
+            self.thread = None
+
+    def refresh(self):
+        # Scan now, e.g. from a refresh button; `refreshed` reports the result
+        self.forced = True
+        self.wake.set()
+
+    def ports(self):
+        with self.lock:
+            return dict(self.known)
+
+    def run(self):
+        while self.running:
+            forced, self.forced = self.forced, False
+            self.scan(forced)
+            self.wake.wait(self.interval)
+            self.wake.clear()
+
+    def dev_changed(self):
+        if not sys.platform.startswith("linux"):
+            return True
+        try:
+            entries = frozenset(name for name in os.listdir("/dev") if name.startswith("tty"))
+        except OSError:
+            return True
+        changed, self.dev_entries = entries != self.dev_entries, entries
+        return changed
+
+    def scan(self, forced=False):
+        if self.dev_changed() or forced:
+            self.scans += 1
+            current = {port.device: port.description for port in serial.tools.list_ports.comports()}
+            with self.lock:
+                added = [(device, current[device]) for device in sorted(current) if device not in self.known]
+                removed = [device for device in self.known if device not in current]
+                self.known = current
+            if removed:
+                self.ports_removed.emit(removed)
+            if added:
+                self.ports_added.emit(added)
+        if forced:
+            self.refreshed.emit(len(self.known))
+
+_shared = None
+
+def shared_watcher(interval=3.0):
+    # One watcher thread per process, however many windows list ports
+    global _shared
+    if _shared is None:
+        _shared = PortWatcher(interval)
+        _shared.start()
+    return _shared
+
+def measure(rounds=20):
+    # Cost of one comports() call against the /dev listing that gates it on Linux
+    watcher = PortWatcher()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        serial.tools.list_ports.comports()
+    comports_ms = (time.perf_counter() - start) / rounds * 1000
+    start = time.perf_counter()
+    for _ in range(rounds):
+        watcher.dev_changed()
+    listing_ms = (time.perf_counter() - start) / rounds * 1000
+    print(f"comports() {comports_ms:.2f} ms, /dev listing {listing_ms:.2f} ms per scan")
+
+if __name__ == "__main__":
+    # Example usage: python port_watcher.py
+    measure()
@@ -0,0 +1,208 @@
+import sys
+import time
+import queue
+import threading
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Local live feed of the readings, standard library only so the headless collector can use it.
+#   GET /stream   newline-delimited JSON, one {"timestamp", "celsius"} object per sample
+#   GET /metrics  Prometheus text format counters
+# Every subscriber has a bounded queue; a client that lets it fill up is disconnected
+# instead of slowing down the reader or the other clients.
+
+DEFAULT_PORT = 8765
+LINE_FORMAT = '{"timestamp": %.6f, "celsius": %.4f}\n'
+
+class Subscriber:
+    def __init__(self, max_buffer):
+        self.queue = queue.Queue(maxsize=max_buffer)  # batches, not samples
+        self.dropped = False
+
+class PublisherHandler(BaseHTTPRequestHandler):
+    timeout = 10  # a client that stops reading fails its next write after this long
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            body = self.server.publisher.metrics().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path == "/stream":
+            self.stream()
+        else:
+            self.send_error(404)
+
+    def stream(self):
+        publisher = self.server.publisher
+        subscriber = publisher.subscribe()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        try:
+            while publisher.running and not subscriber.dropped:
+                try:
+                    timestamps, temps = subscriber.queue.get(timeout=1.0)
+                except queue.Empty:
+                    continue
+                lines = "".join(LINE_FORMAT % sample for sample in zip(timestamps, temps))
+                self.wfile.write(lines.encode())
+                self.wfile.flush()
+        except OSError:
+            pass  # client went away or timed out
+        finally:
+            publisher.unsubscribe(subscriber)
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass  # one line per request would flood the console of a long-lived process
+
+class SamplePublisher:
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, max_buffer=256, rate_window=10.0):
+        self.host = host
+        self.port = port
+        self.max_buffer = max_buffer
+        self.lock = threading.Lock()
+        self.subscribers = set()
+        self.running = False
+        self.server = None
+        self.thread = None
+
+        # Counters
+        self.samples_total = 0
+        self.dropped_subscribers = 0
+        self.latest = None
+        self.rate_window = rate_window
+        self.started_at = time.time()
+        self.recent = deque()  # (time, samples) of the last rate_window seconds
+        self.counters = {}     # name -> (help, function, kind) read at scrape time
+
+    def start(self):
+        self.server = ThreadingHTTPServer((self.host, self.port), PublisherHandler)
+        self.server.daemon_threads = True
+        self.server.publisher = self
+        self.port = self.server.server_address[1]  # port 0 picks a free one
+        self.started_at = time.time()
+        self.running = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def subscribe(self):
+        subscriber = Subscriber(self.max_buffer)
+        with self.lock:
+            self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def register_counter(self, name, help_text, function, kind="counter"):
+        # e.g. parse errors or reconnects, owned by the code that produces the samples
+        self.counters[name] = (help_text, function, kind)
+
+    def publish(self, timestamps, temps):
+        # Never blocks: one batch per subscriber queue, slow subscribers are dropped
+        if not len(temps):
+            return
+        batch = ([float(t) for t in timestamps], [float(c) for c in temps])
+        now = time.time()
+        with self.lock:
+            self.samples_total += len(temps)
+            self.latest = batch[1][-1]
+            self.recent.append((now, len(temps)))
+            while self.recent and self.recent[0][0] < now - self.rate_window:
+                self.recent.popleft()
+            for subscriber in list(self.subscribers):
+                try:
+                    subscriber.queue.put_nowait(batch)
+                except queue.Full:
+                    subscriber.dropped = True
+                    self.subscribers.discard(subscriber)
+                    self.dropped_subscribers += 1
+
+    def samples_per_second(self):
+        with self.lock:
+            now = time.time()
+            # Right after start the window is not full yet: divide by the time covered so far
+            window = min(self.rate_window, now - self.started_at)
+            if window <= 0:
+                return 0.0
+            return sum(n for t, n in self.recent if t >= now - self.rate_window) / window
+
+    def metrics(self):
+        values = [
+            ("temperature_samples_total", "counter", "Samples received from the board", self.samples_total),
+            ("temperature_samples_per_second", "gauge",
+             f"Samples per second over the last {self.rate_window:g} s", self.samples_per_second()),
+            ("temperature_subscribers", "gauge", "Connected /stream clients", len(self.subscribers)),
+            ("temperature_dropped_subscribers_total", "counter",
+             "Clients disconnected for not keeping up", self.dropped_subscribers),
+        ]
+        if self.latest is not None:
+            values.append(("temperature_celsius", "gauge", "Latest reading", self.latest))
+        values += [(name, kind, help_text, function()) for name, (help_text, function, kind) in self.counters.items()]
+
+        lines = []
+        for name, kind, help_text, value in values:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value:g}"]
+        return "\n".join(lines) + "\n"
+
+def benchmark(subscribers=20, slow=2, seconds=3.0, rate=100000):
+    # Fan-out to many /stream clients, a few of which never read
+    import socket
+    from urllib.request import urlopen
+
+    publisher = SamplePublisher(port=0, max_buffer=64)
+    publisher.start()
+    received = [0] * subscribers
+    sockets = []
+
+    def reader(i):
+        with urlopen(f"http://127.0.0.1:{publisher.port}/stream") as stream:
+            for _ in stream:
+                received[i] += 1
+
+    for i in range(subscribers):
+        if i < slow:
+            sock = socket.socket()
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+            sock.connect(("127.0.0.1", publisher.port))
+            sock.sendall(b"GET /stream HTTP/1.0\r\n\r\n")
+            sockets.append(sock)  # connected, never read
+        else:
+            threading.Thread(target=reader, args=(i,), daemon=True).start()
+    time.sleep(0.5)
+
+    start = time.perf_counter()
+    sent = 0
+    batch = 200
+    while time.perf_counter() - start < seconds:
+        publisher.publish([time.time()] * batch, [25.0] * batch)
+        sent += batch
+        time.sleep(batch / rate)
+    publish_time = time.perf_counter() - start
+    time.sleep(0.5)
+
+    fast = received[slow:]
+    print(f"published {sent} samples in {publish_time:.2f} s to {subscribers} clients")
+    print(f"fast clients received {min(fast)}..{max(fast)} samples, "
+          f"{publisher.dropped_subscribers} slow client(s) dropped")
+    print(publisher.metrics())
+    publisher.stop()
+    for sock in sockets:
+        sock.close()
+
+if __name__ == "__main__":
+    # Example usage: python publisher.py [subscribers] [slow subscribers]
+    args = [int(a) for a in sys.argv[1:3]]
+    benchmark(*args)
@@ -0,0 +1,137 @@
+import os
+import sys
+import time
+import random
+import threading
+
+# Event-driven line reader for the FPGA UART stream. read_lines() blocks inside the
+# driver (pyserial waits with select() on POSIX) until data arrives or the port timeout
+# expires, then takes every byte already waiting in one call. It never sleeps while
+# data is pending.
+
+class LineReader:
+    def __init__(self, port, max_line=256):
+        self.port = port              # serial.Serial opened with a read timeout
+        self.max_line = max_line      # longer unterminated data is discarded as noise
+        self.buffer = bytearray()     # reused between calls, holds a partial line
+        self.bytes_read = 0
+        self.lines_read = 0
+
+    def read_lines(self):
+        # Returns the complete lines received so far (without the LF), [] on timeout
+        data = self.port.read(max(1, self.port.in_waiting))
+        if not data:
+            return []
+        return self.split_lines(data)
+
+    def split_lines(self, data):
+        # Complete lines in data plus the partial line left from the previous call
+        self.bytes_read += len(data)
+        buf = self.buffer
+        buf += data
+
+        end = buf.rfind(b"\n")
+        if end < 0:
+            if len(buf) > self.max_line:
+                del buf[:]
+            return []
+        lines = bytes(buf[:end]).split(b"\n")
+        del buf[:end + 1]
+        self.lines_read += len(lines)
+        return lines
+
+class Backoff:
+    # Reconnect delays: base, 2*base, 4*base ... capped at maximum. Each delay is drawn
+    # from the upper half of its step so boards on one USB hub do not retry in lockstep.
+    def __init__(self, base=0.5, maximum=30.0):
+        self.base = base
+        self.maximum = maximum
+        self.attempt = 0
+
+    def reset(self):
+        self.attempt = 0
+
+    def next_delay(self):
+        delay = min(self.maximum, self.base * 2 ** self.attempt)
+        self.attempt += 1
+        return random.uniform(delay / 2, delay)
+
+def parse_temperature(line):
+    # "hundreds tens ones CR" -> float, None for anything that is not a number
+    try:
+        return float(line.decode("ascii", errors="ignore").strip())
+    except ValueError:
+        return None
+
+def polling_read(port, duration, on_value):
+    # The previous SerialManager.read_loop: in_waiting, readline(), sleep(0.1)
+    end = time.time() + duration
+    while time.time() < end:
+        if port.in_waiting > 0:
+            value = parse_temperature(port.readline())
+            if value is not None:
+                on_value(value)
+        time.sleep(0.1)
+
+def event_read(port, duration, on_value):
+    reader = LineReader(port)
+    end = time.time() + duration
+    while time.time() < end:
+        for line in reader.read_lines():
+            value = parse_temperature(line)
+            if value is not None:
+                on_value(value)
+
+def benchmark(duration=2.0, lines_per_second=2000):
+    # Fake FPGA on a pty: a thread writes "025\r\n" style lines at a fixed rate
+    import pty
+    import serial
+
+    results = {}
+    for name, loop in (("polling", polling_read), ("event", event_read)):
+        master, slave = pty.openpty()
+        port = serial.Serial(os.ttyname(slave), 9600, timeout=0.1)
+        running = True
+        sent = {}
+
+        def device():
+            interval = 1.0 / lines_per_second
+            next_time = time.perf_counter()
+            i = 0
+            while running:
+                sent[i % 1000] = time.perf_counter()
+                os.write(master, b"%03d\r\n" % (i % 1000))
+                i += 1
+                next_time += interval
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+        received = []
+        latencies = []
+
+        def on_value(value):
+            latencies.append(time.perf_counter() - sent.get(int(value), time.perf_counter()))
+            received.append(value)
+
+        writer = threading.Thread(target=device, daemon=True)
+        writer.start()
+        loop(port, duration, on_value)
+        running = False
+        writer.join()
+        port.close()
+        os.close(master)
+        os.close(slave)
+
+        latencies.sort()
+        median = latencies[len(latencies) // 2] * 1000 if latencies else float("nan")
+        results[name] = (len(received) / duration, median)
+        print(f"{name:8s} {len(received) / duration:9.1f} lines/s  median latency {median:7.2f} ms")
+    return results
+
+if __name__ == "__main__":
+    # Example usage: python serial_reader.py [seconds] [lines per second]
+    if not sys.platform.startswith(("linux", "darwin")):
+        raise SystemExit("The pty benchmark needs Linux or macOS")
+    args = [float(a) for a in sys.argv[1:3]]
+    benchmark(*args)
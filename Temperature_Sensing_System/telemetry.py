@@ -0,0 +1,210 @@
+import sys
+import time
+
+import numpy as np
+
+from serial_reader import LineReader, parse_temperature
+
+# Binary telemetry frames for the temperature UART, next to the ASCII "hundreds tens ones CR LF"
+# lines (5 bytes per whole degree). A binary frame carries raw 12-bit ADC codes:
+#
+#   byte 0     SYNC (0xA5)
+#   byte 1     sequence number, +1 per frame, wraps at 256
+#   bytes 2-7  4 samples, 12 bits each, two samples per 3 bytes:
+#              b0 = a[7:0], b1 = b[3:0] & a[11:8], b2 = b[11:4]
+#   byte 8     CRC-8 (poly 0x07, init 0) over bytes 1-7
+#
+# 9 bytes per 4 samples is 2.25 bytes per sample, 2.2x the samples per baud of ASCII.
+
+SYNC = 0xA5
+SAMPLES_PER_FRAME = 4
+FRAME_SIZE = 9
+MAX_GAP = 128  # a sequence step beyond this is a board reset (jump back), not lost frames
+ADC_TO_CELSIUS = 500 / 4096  # same scaling as int_temp in main.vhd, without the truncation
+
+def crc8_table(poly=0x07):
+    table = np.zeros(256, dtype=np.uint8)
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = ((crc << 1) ^ poly) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table[i] = crc
+    return table
+
+CRC8 = crc8_table()
+
+def crc8(rows):
+    # CRC of every row of a 2D uint8 array, one column at a time
+    crc = np.zeros(len(rows), dtype=np.uint8)
+    for column in range(rows.shape[1]):
+        crc = CRC8[crc ^ rows[:, column]]
+    return crc
+
+def encode_frames(codes, seq=0):
+    # 12-bit ADC codes -> frame bytes (the length is padded to whole frames with zeros)
+    codes = np.asarray(codes, dtype=np.uint16) & 0x0FFF
+    n = -(-len(codes) // SAMPLES_PER_FRAME)
+    codes = np.pad(codes, (0, n * SAMPLES_PER_FRAME - len(codes))).reshape(-1, 2)
+    a, b = codes[:, 0], codes[:, 1]
+    payload = np.column_stack((a & 0xFF, (a >> 8) | ((b & 0x0F) << 4), b >> 4)).astype(np.uint8)
+
+    frames = np.zeros((n, FRAME_SIZE), dtype=np.uint8)
+    frames[:, 0] = SYNC
+    frames[:, 1] = (seq + np.arange(n)) & 0xFF
+    frames[:, 2:8] = payload.reshape(n, 6)
+    frames[:, 8] = crc8(frames[:, 1:8])
+    return frames.tobytes()
+
+class FrameParser:
+    # Streaming, vectorized frame decoder: feed() any chunk of bytes, get the ADC codes back
+    OFFSETS = np.arange(FRAME_SIZE)
+
+    def __init__(self):
+        self.pending = b""        # bytes that may still start a frame
+        self.last_seq = None
+        self.frames = 0
+        self.lost_samples = 0     # from gaps in the sequence numbers
+        self.duplicates = 0       # repeated frames (same sequence number), dropped
+        self.resyncs = 0          # sequence jumps back, e.g. after a board reset
+        self.skipped_bytes = 0    # noise or broken frames between valid ones
+
+    def feed(self, data):
+        buf = np.frombuffer(self.pending + data, dtype=np.uint8)
+        last_start = len(buf) - FRAME_SIZE
+
+        # Every SYNC byte is a candidate; the CRC decides which ones are frames
+        starts = np.flatnonzero(buf[:max(0, last_start + 1)] == SYNC)
+        rows = buf[starts[:, None] + self.OFFSETS]
+        starts = starts[crc8(rows[:, 1:8]) == rows[:, 8]]
+        if np.any(np.diff(starts) < FRAME_SIZE):
+            starts = self.non_overlapping(starts)  # a SYNC inside a payload passed the CRC
+        rows = buf[starts[:, None] + self.OFFSETS]
+
+        end = starts[-1] + FRAME_SIZE if len(starts) else 0
+        keep = max(end, last_start + 1)  # an incomplete frame may start in the last 8 bytes
+        self.skipped_bytes += keep - len(starts) * FRAME_SIZE
+        self.pending = buf[keep:].tobytes()
+        if not len(starts):
+            return np.zeros(0, dtype=np.uint16)
+
+        rows = rows[self.count_lost(rows[:, 1])]
+        self.frames += len(rows)
+        payload = rows[:, 2:8].reshape(-1, 3).astype(np.uint16)
+        a = payload[:, 0] | ((payload[:, 1] & 0x0F) << 8)
+        b = (payload[:, 1] >> 4) | (payload[:, 2] << 4)
+        return np.column_stack((a, b)).ravel()
+
+    @staticmethod
+    def non_overlapping(starts):
+        kept = []
+        for start in starts.tolist():
+            if not kept or start >= kept[-1] + FRAME_SIZE:
+                kept.append(start)
+        return np.array(kept, dtype=starts.dtype)
+
+    def count_lost(self, seq):
+        # Counts the frames missing between sequence numbers; returns the mask of frames
+        # to keep, which drops repeats of the frame before
+        seq = seq.astype(np.int16)
+        previous = np.concatenate(([seq[0] - 1 if self.last_seq is None else self.last_seq], seq[:-1]))
+        steps = (seq - previous) & 0xFF
+        duplicate = steps == 0
+        resync = steps > MAX_GAP  # started over from a lower number, nothing known to be lost
+        gaps = np.where(duplicate | resync, 0, steps - 1)
+        self.duplicates += int(duplicate.sum())
+        self.resyncs += int(resync.sum())
+        self.lost_samples += int(gaps.sum()) * SAMPLES_PER_FRAME
+        self.last_seq = int(seq[-1])
+        return ~duplicate
+
+ASCII_BYTES = set(b"0123456789.+- \r\n")
+
+class TelemetryReader:
+    # Reads either format from a serial port and returns °C arrays. The format is
+    # detected from the first bytes: two valid binary frames, or two clean ASCII lines.
+    # calibrate(codes) -> °C replaces the nominal ADC scaling, e.g. CalibrationPipeline.process.
+
+    def __init__(self, port, mode=None, max_probe=256, calibrate=None):
+        self.port = port
+        self.calibrate = calibrate
+        self.mode = mode          # None until detected, then "ascii" or "binary"
+        self.max_probe = max_probe
+        self.probe = b""
+        self.lines = LineReader(port)
+        self.frames = FrameParser()
+        self.bytes_read = 0
+        self.parse_errors = 0     # ASCII lines that were not numbers
+
+    def read_temperatures(self):
+        # Blocks like LineReader.read_lines(); empty array on timeout or while detecting
+        data = self.port.read(max(1, self.port.in_waiting))
+        if not data:
+            return np.zeros(0)
+        self.bytes_read += len(data)
+        if self.mode is None:
+            data = self.detect(data)
+            if self.mode is None:
+                return np.zeros(0)
+        return self.decode(data)
+
+    def detect(self, data):
+        # Returns the buffered bytes once the mode is known
+        self.probe += data
+        probe = FrameParser()
+        probe.feed(self.probe)
+        if probe.frames >= 2:
+            self.mode = "binary"
+        else:
+            first, last = self.probe.find(b"\n"), self.probe.rfind(b"\n")
+            if first != last and set(self.probe[first + 1:last]) <= ASCII_BYTES:
+                self.mode = "ascii"
+            elif len(self.probe) > self.max_probe:
+                self.probe = self.probe[-self.max_probe:]  # noise, keep looking
+        if self.mode is None:
+            return b""
+        data, self.probe = self.probe, b""
+        return data
+
+    def decode(self, data):
+        if self.mode == "binary":
+            codes = self.frames.feed(data)
+            return self.calibrate(codes) if self.calibrate else codes * ADC_TO_CELSIUS
+        values = [parse_temperature(line) for line in self.lines.split_lines(data)]
+        temps = [v for v in values if v is not None]
+        self.parse_errors += len(values) - len(temps)
+        return np.array(temps)
+
+    def lost_samples(self):
+        return self.frames.lost_samples
+
+def benchmark(seconds=10.0, baud=9600):
+    # Samples per second the line can carry in each format, and host decode throughput
+    bytes_per_second = baud / 10  # 8N1
+    ascii_rate = bytes_per_second / 5
+    binary_rate = bytes_per_second / FRAME_SIZE * SAMPLES_PER_FRAME
+    print(f"{baud} baud: ASCII {ascii_rate:.0f} samples/s, binary {binary_rate:.0f} samples/s "
+          f"({binary_rate / ascii_rate:.2f}x)")
+
+    n = int(binary_rate * seconds) // SAMPLES_PER_FRAME * SAMPLES_PER_FRAME
+    codes = np.random.default_rng(0).integers(0, 4096, n)
+    ascii_data = b"".join(b"%03d\r\n" % (c * 500 // 4096) for c in codes)
+    binary_data = encode_frames(codes)
+
+    start = time.perf_counter()
+    lines = LineReader(None).split_lines(ascii_data)
+    ascii_values = [parse_temperature(line) for line in lines]
+    ascii_time = time.perf_counter() - start
+
+    parser = FrameParser()
+    start = time.perf_counter()
+    binary_values = parser.feed(binary_data)
+    binary_time = time.perf_counter() - start
+
+    assert np.array_equal(binary_values, codes) and len(ascii_values) == n
+    print(f"decode {n} samples: ASCII {ascii_time * 1000:.1f} ms, binary {binary_time * 1000:.1f} ms "
+          f"({ascii_time / binary_time:.0f}x)")
+
+if __name__ == "__main__":
+    # Example usage: python telemetry.py [seconds of data] [baud]
+    args = [float(a) for a in sys.argv[1:3]]
+    benchmark(*args)